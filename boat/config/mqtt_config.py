@@ -7,7 +7,7 @@ Handles configuration loading, validation, and environment variable management
 import os
 import logging
 from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, fields
 from pathlib import Path
 
 try:
@@ -425,13 +425,18 @@ def load_geofence_zones(config_file: str = None) -> List[GeofenceZone]:
         
         zones = []
         for zone_data in zones_data.get('zones', []):
-            zone = GeofenceZone(
-                name=zone_data['name'],
-                center_lat=zone_data['center_lat'],
-                center_lon=zone_data['center_lon'],
-                radius_meters=zone_data['radius_meters'],
-                zone_type=zone_data['zone_type']
-            )
+            # Validate each zone on its own so one bad entry doesn't drop every fence
+            try:
+                zone = GeofenceZone(
+                    name=zone_data['name'],
+                    center_lat=zone_data['center_lat'],
+                    center_lon=zone_data['center_lon'],
+                    radius_meters=zone_data['radius_meters'],
+                    zone_type=str(zone_data['zone_type']).strip().lower()
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                logging.getLogger(__name__).error(f"Skipping invalid geofence zone {zone_data!r}: {e}")
+                continue
             zones.append(zone)
         
         logging.getLogger(__name__).info(f"Loaded {len(zones)} geofence zones")
@@ -448,7 +453,8 @@ def save_geofence_zones(zones: List[GeofenceZone], config_file: str = None) -> b
     
     try:
         zones_data = {
-            'zones': [asdict(zone) for zone in zones]
+            # Only constructor fields; derived values are recomputed on load
+            'zones': [{f.name: getattr(zone, f.name) for f in fields(zone) if f.init} for zone in zones]
         }
         
         os.makedirs(os.path.dirname(geofence_file), exist_ok=True)
@@ -2,6 +2,7 @@ import serial
 import pynmea2
 import logging
 import time
+import select
 import threading
 import decimal  # Add import for decimal module
 from datetime import datetime
@@ -9,6 +10,14 @@ from .agps_helper import AGPSHelper  # Import A-GPS helper
 
 logger = logging.getLogger("GPSHandler")
 
+# Bulk-read the UART once about one NMEA sentence's worth of bytes is queued; below that,
+# wait roughly the time 64 bytes take to arrive at 9600 baud before draining what is there.
+# With nothing queued the reader blocks in select() until the next burst starts.
+SERIAL_READ_THRESHOLD = 64
+SERIAL_POLL_INTERVAL = 0.064
+# Drop a partial line that grows past this without a newline (e.g. binary UBX output)
+MAX_PENDING_LINE_BYTES = 1024
+
 class GPSHandler:
     """
     Enhanced GPS handler for u-blox 7 GPS/GNSS receiver.
@@ -19,10 +28,11 @@ class GPSHandler:
     - Time and date information (ZDA)
     - u-blox proprietary data (PUBX sentences)
     """
-    def __init__(self, port='/dev/ttyACM0', baudrate=9600, timeout=1):
+    def __init__(self, port='/dev/ttyACM0', baudrate=9600, timeout=1, low_latency=False):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.low_latency = low_latency  # Request ASYNC_LOW_LATENCY on the port when opened
         self.serial_conn = None
         self.running = False
         self.thread = None
@@ -78,6 +88,25 @@ class GPSHandler:
         # Lock for thread safety when accessing GPS data
         self.lock = threading.Lock()
         
+        # Callbacks pushed get_position() data on every GGA fix (copy-on-write list)
+        self._position_subscribers = []
+        
+        # Sentence class -> handler, so each parsed sentence costs one dict lookup
+        # instead of walking an isinstance chain
+        self._nmea_handlers = {
+            pynmea2.GGA: self._process_gga,  # Global Positioning System Fix Data
+            pynmea2.RMC: self._process_rmc,  # Recommended minimum navigation information
+            pynmea2.GLL: self._process_gll,  # Geographic Position - Latitude/Longitude
+            pynmea2.VTG: self._process_vtg,  # Track made good and ground speed
+            pynmea2.GSA: self._process_gsa,  # GPS DOP and active satellites
+            pynmea2.GSV: self._process_gsv,  # Satellites in view
+            pynmea2.GBS: self._process_gbs,  # GPS Satellite Fault Detection
+            pynmea2.GRS: self._process_grs,  # GPS Range Residuals
+            pynmea2.GST: self._process_gst,  # GPS Pseudorange Noise Statistics
+            pynmea2.ZDA: self._process_zda,  # Time & Date
+            pynmea2.TXT: self._process_txt,  # Text transmission
+        }
+        
         # A-GPS helper
         self.agps_helper = AGPSHelper(port=self.port, baudrate=self.baudrate)
         self.last_agps_update = None
@@ -134,6 +163,9 @@ class GPSHandler:
             )
             logger.info(f"Connected to GPS device on {self.port}")
             
+            if self.low_latency:
+                self._enable_low_latency()
+            
             self.running = True
             self.thread = threading.Thread(target=self._read_gps_data)
             self.thread.daemon = True
@@ -151,6 +183,17 @@ class GPSHandler:
                 self.serial_conn.close()
                 self.serial_conn = None
     
+    def _enable_low_latency(self):
+        """
+        Ask the USB-serial driver to hand over bytes immediately rather than batching them
+        on its latency timer (~16 ms on FTDI adapters). Not every driver supports it.
+        """
+        try:
+            self.serial_conn.set_low_latency_mode(True)
+            logger.info(f"Low-latency mode enabled on {self.port}")
+        except (AttributeError, OSError, ValueError) as e:
+            logger.warning(f"Low-latency mode not available on {self.port}: {str(e)}")
+    
     def stop(self):
         """Stop reading GPS data."""
         self.running = False
@@ -167,16 +210,43 @@ class GPSHandler:
         """Background thread to continuously read and parse GPS data."""
         no_fix_duration = 0
         check_interval = 10  # Check every 10 seconds
+        pending = bytearray()  # Unterminated tail of the last read, reused across reads
         
         while self.running:
             try:
                 if not self.serial_conn or not self.serial_conn.is_open:
                     logger.error("Serial connection closed. Attempting to reconnect...")
+                    pending.clear()
                     time.sleep(5)
                     self.start()
                     continue
                 
-                line = self.serial_conn.readline().decode('ascii', errors='replace').strip()
+                # Drain queued bytes in one read rather than readline(), which costs a
+                # read call per byte, and split complete sentences out of the buffer
+                waiting = self.serial_conn.in_waiting
+                if waiting < SERIAL_READ_THRESHOLD:
+                    if not waiting:
+                        readable, _, _ = select.select([self.serial_conn], [], [], self.timeout)
+                        if not readable:
+                            continue
+                    time.sleep(SERIAL_POLL_INTERVAL)
+                    waiting = self.serial_conn.in_waiting
+                    if not waiting:
+                        continue
+                
+                pending += self.serial_conn.read(waiting)
+                end = pending.rfind(b'\n') + 1
+                lines = pending[:end].split(b'\n') if end else ()
+                del pending[:end]
+                if len(pending) > MAX_PENDING_LINE_BYTES:
+                    pending.clear()
+            except Exception as e:
+                logger.error(f"Error reading GPS data: {str(e)}")
+                time.sleep(1)
+                continue
+            
+            for raw_line in lines:
+                line = raw_line.decode('ascii', errors='replace').strip()
                 if not line:
                     continue
                     
@@ -185,6 +255,10 @@ class GPSHandler:
                     msg = pynmea2.parse(line)
                     self._process_nmea_message(msg)
                     
+                    # Push the new fix to subscribers once per GGA sentence
+                    if self._position_subscribers and isinstance(msg, pynmea2.GGA):
+                        self._notify_position_subscribers()
+                    
                     # Check if we have a fix
                     if not self.has_fix():
                         no_fix_duration += 1
@@ -208,10 +282,27 @@ class GPSHandler:
                 except Exception as e:
                     logger.debug(f"Error parsing sentence '{line[:30]}...': {str(e)}")
                     continue
-                    
+    
+    def subscribe(self, callback):
+        """
+        Register a callback invoked with get_position() data on every new fix.
+        Callbacks run on the GPS reader thread and must not block.
+        """
+        if callback not in self._position_subscribers:
+            self._position_subscribers = self._position_subscribers + [callback]
+    
+    def unsubscribe(self, callback):
+        """Remove a callback registered with subscribe()."""
+        self._position_subscribers = [cb for cb in self._position_subscribers if cb != callback]
+    
+    def _notify_position_subscribers(self):
+        """Send the current position to all subscribers."""
+        position = self.get_position()
+        for callback in self._position_subscribers:
+            try:
+                callback(position)
             except Exception as e:
-                logger.error(f"Error reading GPS data: {str(e)}")
-                time.sleep(1)
+                logger.error(f"GPS subscriber callback error: {str(e)}")
     
     def _process_nmea_message(self, msg):
         """Process different types of NMEA messages."""
@@ -224,49 +315,9 @@ class GPSHandler:
                     else:
                         self.timestamp = str(msg.timestamp)
                 
-                # GGA message - Global Positioning System Fix Data
-                if isinstance(msg, pynmea2.GGA):
-                    self._process_gga(msg)
-                
-                # RMC message - Recommended minimum navigation information
-                elif isinstance(msg, pynmea2.RMC):
-                    self._process_rmc(msg)
-                
-                # GLL message - Geographic Position - Latitude/Longitude
-                elif isinstance(msg, pynmea2.GLL):
-                    self._process_gll(msg)
-                
-                # VTG message - Track made good and ground speed
-                elif isinstance(msg, pynmea2.VTG):
-                    self._process_vtg(msg)
-                
-                # GSA message - GPS DOP and active satellites
-                elif isinstance(msg, pynmea2.GSA):
-                    self._process_gsa(msg)
-                
-                # GSV message - Satellites in view
-                elif isinstance(msg, pynmea2.GSV):
-                    self._process_gsv(msg)
-                
-                # GBS message - GPS Satellite Fault Detection
-                elif isinstance(msg, pynmea2.GBS):
-                    self._process_gbs(msg)
-                
-                # GRS message - GPS Range Residuals
-                elif isinstance(msg, pynmea2.GRS):
-                    self._process_grs(msg)
-                
-                # GST message - GPS Pseudorange Noise Statistics
-                elif isinstance(msg, pynmea2.GST):
-                    self._process_gst(msg)
-                
-                # ZDA message - Time & Date
-                elif isinstance(msg, pynmea2.ZDA):
-                    self._process_zda(msg)
-                
-                # TXT message - Text transmission
-                elif isinstance(msg, pynmea2.TXT):
-                    self._process_txt(msg)
+                handler = self._nmea_handlers.get(type(msg))
+                if handler is not None:
+                    handler(msg)
                 
             except Exception as e:
                 logger.error(f"Error processing NMEA message: {str(e)}")
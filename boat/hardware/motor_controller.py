@@ -1,8 +1,10 @@
 import atexit
 import os
+import signal
 from rpi_hardware_pwm import HardwarePWM
 import time
 import logging
+import queue
 import threading
 
 logger = logging.getLogger("MotorController")
@@ -27,17 +29,36 @@ PWM_FREQUENCY = 50
 # Default to ±90 degrees for safety, but servo supports up to ±135
 MAX_RUDDER_ANGLE = float(os.getenv('RUDDER_MAX_ANGLE', 45))
 
-# Global variables to track PWM instances for emergency shutdown
-_global_pwm_instances = []
+# Duty-cycle slopes (percent per unit): 270° servo spans 2.5-12.5%, ESC spans 5-10%
+_DEG_TO_DUTY_SLOPE = 5.0 / 135.0
+_SPEED_TO_DUTY_SLOPE = 2.5 / 100.0
+
+# Direction labels for log messages, indexed by sign + 1
+_THRUST_LABEL = ('reverse', 'stop', 'forward')
+_RUDDER_LABEL = ('port', 'center', 'starboard')
+
+# PWM period in nanoseconds (sysfs duty_cycle is written in ns)
+PWM_PERIOD_NS = 1_000_000_000 // PWM_FREQUENCY
+
+# Real-time (SCHED_FIFO) priority for the throttle ramp worker; needs root or CAP_SYS_NICE
+THROTTLE_WORKER_RT_PRIORITY = 10
+
+# Duty-cycle changes smaller than this (in percent) are not written to the hardware
+DUTY_CYCLE_EPSILON = 0.01
+DUTY_CYCLE_EPSILON_NS = int(PWM_PERIOD_NS * DUTY_CYCLE_EPSILON / 100)
+
+# Neutral/center pulse (1.5ms) as the raw sysfs duty_cycle payload
+NEUTRAL_DUTY_NS = b"%d\n" % (PWM_PERIOD_NS * 75 // 1000)
+
+# Global registry of PWM instances for emergency shutdown, keyed by id() for O(1) removal
+_global_pwm_instances = {}
 
 # Emergency cleanup function that will be called at exit
 def _emergency_pwm_cleanup():
     """Global emergency cleanup for all PWM instances at program exit"""
-    global _global_pwm_instances
-    
     if _global_pwm_instances:
         print("Performing emergency PWM cleanup at exit")
-        for pwm_instance in _global_pwm_instances:
+        for pwm_instance in _global_pwm_instances.values():
             try:
                 # For thrust PWM, set to neutral position
                 if pwm_instance.pwm_channel == THRUST_CHANNEL:
@@ -60,12 +81,89 @@ def _emergency_pwm_cleanup():
             except Exception as e:
                 print(f"Error during emergency PWM cleanup: {e}")
         
-        # Clear the list
-        _global_pwm_instances = []
+        # Clear the registry
+        _global_pwm_instances.clear()
 
 # Register the emergency cleanup function
 atexit.register(_emergency_pwm_cleanup)
 
+# Open sysfs duty_cycle fds that the SIGTERM handler drives to neutral
+_neutral_duty_fds = set()
+_previous_sigterm_handler = None
+
+def _sigterm_pwm_neutral(signum, frame):
+    """
+    SIGTERM handler: write the neutral pulse straight to every open duty_cycle fd
+    before anything else runs, then hand over to the previously installed handler
+    (graceful application shutdown) or exit immediately if there was none.
+    """
+    for fd in tuple(_neutral_duty_fds):
+        try:
+            os.pwrite(fd, NEUTRAL_DUTY_NS, 0)
+        except OSError:
+            pass
+    
+    if callable(_previous_sigterm_handler):
+        _previous_sigterm_handler(signum, frame)
+    elif _previous_sigterm_handler != signal.SIG_IGN:
+        os._exit(0)
+
+def _install_sigterm_handler():
+    """Install _sigterm_pwm_neutral once, chaining to the existing SIGTERM handler"""
+    global _previous_sigterm_handler
+    
+    current = signal.getsignal(signal.SIGTERM)
+    if current is _sigterm_pwm_neutral:
+        return
+    try:
+        signal.signal(signal.SIGTERM, _sigterm_pwm_neutral)
+    except ValueError:
+        # Handlers can only be installed from the main thread; atexit cleanup still applies
+        logger.debug("SIGTERM PWM handler not installed (not in main thread)")
+        return
+    _previous_sigterm_handler = current
+
+
+class _DutyCycleWriter:
+    """
+    Fast duty-cycle updates for one HardwarePWM channel.
+    Keeps the channel's sysfs duty_cycle file open and pwrite()s the nanosecond value,
+    skipping writes that would not change the output. Falls back to
+    HardwarePWM.change_duty_cycle if the sysfs file cannot be opened.
+    
+    Registers are deliberately not mmap'd: on the Pi 5 the PWM block lives in the RP1
+    chip behind PCIe (not in /dev/gpiomem), is owned by the kernel pwm driver, and one
+    pwrite per 20ms servo period is already far below the output's own latency.
+    """
+    def __init__(self, pwm, initial_duty_ns):
+        self.pwm = pwm
+        self.last_duty_ns = initial_duty_ns
+        self.fd = None
+        
+        pwm_dir = getattr(pwm, 'pwm_dir', f"/sys/class/pwm/pwmchip{CHIP}/pwm{pwm.pwm_channel}")
+        try:
+            self.fd = os.open(os.path.join(pwm_dir, "duty_cycle"), os.O_WRONLY)
+            _neutral_duty_fds.add(self.fd)
+        except OSError as e:
+            logger.warning(f"Direct sysfs duty-cycle writes unavailable, using HardwarePWM: {e}")
+    
+    def write_ns(self, duty_ns):
+        """Set the duty cycle (nanoseconds of high time per period)"""
+        if abs(duty_ns - self.last_duty_ns) < DUTY_CYCLE_EPSILON_NS:
+            return
+        if self.fd is not None:
+            os.pwrite(self.fd, b"%d\n" % duty_ns, 0)
+        else:
+            self.pwm.change_duty_cycle(duty_ns * 100 / PWM_PERIOD_NS)
+        self.last_duty_ns = duty_ns
+    
+    def close(self):
+        """Close the cached sysfs file descriptor"""
+        if self.fd is not None:
+            _neutral_duty_fds.discard(self.fd)
+            os.close(self.fd)
+            self.fd = None
+
 class MotorController:
     """
     Controls the boat's motors using hardware PWM for rudder (servo) and thrust (ESC)
@@ -77,31 +175,60 @@ class MotorController:
         self.current_thrust = 0  # Keep track of current thrust level
         self.current_rudder = 0  # Keep track of current rudder position in degrees
         
-        # Add locks for thread safety
-        self.thrust_lock = threading.Lock()
-        self.rudder_lock = threading.Lock()
+        # Duty-cycle writers (cached sysfs fds) for each channel, created in initialize()
+        self._thrust_writer = None
+        self._rudder_writer = None
+        
+        # Nanosecond duty values for every integer speed (-100..100) and rudder angle
+        # (-135..135), so the ramp and rudder paths write table entries without float math
+        self._speed_ns = [int(PWM_PERIOD_NS * self.speed_to_duty_cycle(s) / 100) for s in range(-100, 101)]
+        self._rudder_ns = [int(PWM_PERIOD_NS * self.degrees_to_duty_cycle(d) / 100) for d in range(-135, 136)]
+        
+        # One lock serializes all PWM writes (both channels share the PWM chip); position
+        # state is read without locking (attribute assignment is atomic) so status
+        # polling never waits on a ramp
+        self._pwm_lock = threading.Lock()
         
-        # Flag to signal throttle ramping thread to stop
-        self.throttle_thread_running = False
+        # Long-lived throttle ramp worker fed with (speed, ramp_time, step_size) commands
+        # through a one-slot queue: a newer command replaces a pending one and interrupts
+        # the ramp in progress, so bursts coalesce to the latest intent.
+        self._throttle_queue = queue.Queue(maxsize=1)
         self.throttle_thread = None
+        self._throttle_target = 0  # Target of the most recently queued command
+        # Set whenever a command is queued so a ramp sleeping between steps wakes at once
+        self._throttle_wakeup = threading.Event()
     
     def initialize(self):
         """Initialize the PWM hardware for rudder and thrust control"""
         try:
+            # Each channel gets its own HardwarePWM: the kernel requires a separate export per
+            # channel, and this one-off setup is not on any hot path (writes use cached fds)
+            
             # Initialize rudder PWM (servo)
             self.rudder_pwm = HardwarePWM(pwm_channel=RUDDER_CHANNEL, hz=PWM_FREQUENCY, chip=CHIP)
             self.rudder_pwm.start(0)  # Start with 0% duty cycle
+            self._rudder_writer = _DutyCycleWriter(self.rudder_pwm, 0)  # 0% duty = 0 ns
             
-            # Add to global list for emergency cleanup
-            global _global_pwm_instances
-            _global_pwm_instances.append(self.rudder_pwm)
+            # Add to global registry for emergency cleanup
+            _global_pwm_instances[id(self.rudder_pwm)] = self.rudder_pwm
             
             # Initialize thrust PWM (ESC)
             self.thrust_pwm = HardwarePWM(pwm_channel=THRUST_CHANNEL, hz=PWM_FREQUENCY, chip=CHIP)
             self.thrust_pwm.start(7.5)  # Start with neutral position (7.5% duty cycle = 1.5ms pulse)
+            self._thrust_writer = _DutyCycleWriter(self.thrust_pwm, self._speed_ns[100])
+            
+            # Add to global registry for emergency cleanup
+            _global_pwm_instances[id(self.thrust_pwm)] = self.thrust_pwm
             
-            # Add to global list for emergency cleanup
-            _global_pwm_instances.append(self.thrust_pwm)
+            # Drive both channels to neutral directly from the fds if we are sent SIGTERM
+            _install_sigterm_handler()
+            
+            # Start the throttle ramp worker
+            self._throttle_queue = queue.Queue(maxsize=1)
+            self._throttle_target = 0
+            self._throttle_wakeup.clear()
+            self.throttle_thread = threading.Thread(target=self._throttle_worker, daemon=True)
+            self.throttle_thread.start()
             
             self.initialized = True
             logger.info("Boat motor control system initialized")
@@ -120,10 +247,17 @@ class MotorController:
         - 2500µs pulse width (12.5% duty cycle at 50Hz) for 135 degrees
         """
         # Map from [-135, 135] to [2.5, 12.5]
-        duty_cycle = 7.5 + (degrees / 135.0) * 5.0
+        duty_cycle = 7.5 + degrees * _DEG_TO_DUTY_SLOPE
         
         # Ensure duty cycle is within bounds
-        return max(2.5, min(duty_cycle, 12.5))
+        return duty_cycle if 2.5 <= duty_cycle <= 12.5 else (2.5 if duty_cycle < 2.5 else 12.5)
+    
+    def _degrees_to_duty_ns(self, degrees):
+        """Rudder duty cycle in ns; integer angles come from the precomputed table"""
+        index = int(degrees)
+        if index == degrees and -135 <= index <= 135:
+            return self._rudder_ns[index + 135]
+        return int(PWM_PERIOD_NS * self.degrees_to_duty_cycle(degrees) / 100)
     
     def set_rudder(self, degrees):
         """
@@ -144,15 +278,16 @@ class MotorController:
             return False
         
         try:
-            with self.rudder_lock:
-                # Convert degrees to duty cycle
-                duty_cycle = self.degrees_to_duty_cycle(degrees)
-                
+            # Convert degrees to duty cycle
+            duty_ns = self._degrees_to_duty_ns(degrees)
+            
+            with self._pwm_lock:
                 # Set the PWM duty cycle
-                self.rudder_pwm.change_duty_cycle(duty_cycle)
+                self._rudder_writer.write_ns(duty_ns)
                 # Store current rudder position
                 self.current_rudder = degrees
-                logger.info(f"Rudder set to {degrees}° ({'port' if degrees < 0 else 'starboard' if degrees > 0 else 'center'})")
+            
+            logger.info("Rudder set to %s° (%s)", degrees, _RUDDER_LABEL[(degrees > 0) - (degrees < 0) + 1])
             return True
         except Exception as e:
             logger.error(f"Error setting rudder position: {e}")
@@ -168,74 +303,114 @@ class MotorController:
         - 2000µs pulse width (10.0% duty cycle at 50Hz) for 100% (full forward)
         """
         # Map from [-100, 100] to [5.0, 10.0]
-        duty_cycle = 7.5 + (speed / 100.0) * 2.5
+        duty_cycle = 7.5 + speed * _SPEED_TO_DUTY_SLOPE
         
         # Ensure duty cycle is within bounds
-        return max(5.0, min(duty_cycle, 10.0))
+        return duty_cycle if 5.0 <= duty_cycle <= 10.0 else (5.0 if duty_cycle < 5.0 else 10.0)
     
-    def _throttle_ramp_thread(self, target_speed, ramp_time=1.0, step_size=2.0):
+    def _throttle_worker(self):
         """
-        Thread function to handle throttle ramping without blocking
+        Worker thread that runs throttle ramps from the command queue.
+        The queue holds only the newest command, so each ramp starts from the latest intent.
         """
+        # Run ramps at a low real-time priority so networking/logging threads can't delay
+        # PWM steps; pid 0 applies to this thread only. Without CAP_SYS_NICE keep normal scheduling.
         try:
-            with self.thrust_lock:
-                current_speed = self.current_thrust
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(THROTTLE_WORKER_RT_PRIORITY))
+        except (AttributeError, OSError) as e:
+            logger.debug(f"Throttle worker running without real-time priority: {e}")
+        
+        while True:
+            command = self._throttle_queue.get()
+            # Clear after taking the command: anything queued after this point sets it again
+            self._throttle_wakeup.clear()
+            
+            # None is the shutdown sentinel queued by cleanup()
+            if command is None:
+                return
+            
+            self._throttle_ramp(*command)
+    
+    def _queue_throttle_command(self, command):
+        """Queue a command for the ramp worker, replacing any command still pending"""
+        while True:
+            try:
+                self._throttle_queue.put_nowait(command)
+                break
+            except queue.Full:
+                try:
+                    self._throttle_queue.get_nowait()
+                except queue.Empty:
+                    pass
+        self._throttle_wakeup.set()
+    
+    def _throttle_ramp(self, target_speed, ramp_time=1.0, step_size=2.0):
+        """
+        Ramp the thrust to target_speed; returns early if a newer command is queued
+        """
+        try:
+            # Speeds are whole percents (set_throttle snaps the target), so ramp in whole
+            # steps too and every point indexes the duty table directly
+            current_speed = self.current_thrust
+            step_size = max(1, int(step_size))
                 
             # Check if there's a need to ramp (if speed change is significant)
             if abs(target_speed - current_speed) <= step_size:
-                with self.thrust_lock:
-                    duty_cycle = self.speed_to_duty_cycle(target_speed)
-                    self.thrust_pwm.change_duty_cycle(duty_cycle)
+                duty_ns = self._speed_ns[target_speed + 100]
+                with self._pwm_lock:
+                    self._thrust_writer.write_ns(duty_ns)
                     self.current_thrust = target_speed
-                    logger.info(f"Thrust set to {target_speed}% ({'reverse' if target_speed < 0 else 'forward' if target_speed > 0 else 'stop'})")
+                logger.info("Thrust set to %s%% (%s)", target_speed,
+                            _THRUST_LABEL[(target_speed > 0) - (target_speed < 0) + 1])
                 return
                 
-            # Calculate number of steps needed for ramping
+            # Determine step direction and size
             speed_diff = target_speed - current_speed
-            num_steps = abs(int(speed_diff / step_size))
-            if num_steps == 0:
-                num_steps = 1
-                
+            step_direction = 1 if speed_diff > 0 else -1
+            
+            # Precompute the ramp schedule so each step is a lookup, not arithmetic
+            step_increment = step_size * step_direction
+            ramp_speeds = list(range(current_speed + step_increment, target_speed, step_increment))
+            ramp_speeds.append(target_speed)  # Ensure we end exactly at target speed
+            ramp_schedule = [(speed, self._speed_ns[speed + 100]) for speed in ramp_speeds]
+            
             # Calculate delay between steps
+            num_steps = len(ramp_schedule)
             step_delay = ramp_time / num_steps
             
-            # Determine step direction and size
-            step_direction = 1 if speed_diff > 0 else -1
-            
             # Perform the ramping
-            logger.info(f"Adjusting thrust from {current_speed}% to {target_speed}%...")
+            logger.info("Adjusting thrust from %s%% to %s%%...", current_speed, target_speed)
+            
+            # Decide once whether per-step progress is logged at all, and at which steps
+            log_progress = logger.isEnabledFor(logging.DEBUG)
+            log_gate = max(1, num_steps // 4)
             
-            for i in range(1, num_steps + 1):
+            ramp_start = time.monotonic()
+            for i, (intermediate_speed, duty_ns) in enumerate(ramp_schedule, 1):
                 # Check if we should exit early
-                if not self.throttle_thread_running:
+                if not self._throttle_queue.empty():
                     logger.info("Throttle ramping interrupted")
                     return
                     
-                # Calculate intermediate speed
-                if i < num_steps:
-                    intermediate_speed = current_speed + (i * step_size * step_direction)
-                else:
-                    intermediate_speed = target_speed  # Ensure we end exactly at target speed
-                    
                 # Apply the speed
-                with self.thrust_lock:
-                    duty_cycle = self.speed_to_duty_cycle(intermediate_speed)
-                    self.thrust_pwm.change_duty_cycle(duty_cycle)
+                with self._pwm_lock:
+                    self._thrust_writer.write_ns(duty_ns)
                     self.current_thrust = intermediate_speed
                 
                 # Only log progress at 25%, 50%, 75% and completion
-                if i == num_steps or i % max(1, int(num_steps/4)) == 0:
-                    logger.debug(f"  Thrust: {intermediate_speed:.1f}%")
+                if log_progress and (i == num_steps or i % log_gate == 0):
+                    logger.debug("  Thrust: %.1f%%", intermediate_speed)
                 
-                # Wait before next step
-                time.sleep(step_delay)
+                # Wait until this step's absolute deadline so sleep jitter doesn't accumulate;
+                # a newly queued command cuts the wait short
+                remaining = ramp_start + i * step_delay - time.monotonic()
+                if remaining > 0:
+                    self._throttle_wakeup.wait(remaining)
             
-            logger.info(f"Thrust set to {target_speed}% ({'reverse' if target_speed < 0 else 'forward' if target_speed > 0 else 'stop'})")
+            logger.info("Thrust set to %s%% (%s)", target_speed,
+                        _THRUST_LABEL[(target_speed > 0) - (target_speed < 0) + 1])
         except Exception as e:
             logger.error(f"Error in throttle ramp thread: {e}")
-        finally:
-            self.throttle_thread_running = False
-            self.throttle_thread = None
     
     def set_throttle(self, speed, ramp_time=1.0, step_size=2.0):
         """
@@ -245,7 +420,7 @@ class MotorController:
         100 corresponds to full forward thrust (2000µs pulse)
         
         Parameters:
-        - speed: Target thrust (-100 to 100)
+        - speed: Target thrust (-100 to 100), rounded to a whole percent
         - ramp_time: Time in seconds to ramp to target thrust
         - step_size: Size of each step when ramping (smaller = smoother but slower)
         """
@@ -257,21 +432,17 @@ class MotorController:
             logger.warning("Thrust must be between -100 and 100 percent")
             return False
         
+        # Keep thrust on the integer grid of the duty-cycle table
+        speed = int(round(speed))
+        
+        # Already settled at this target: nothing to ramp or write
+        if speed == self._throttle_target and speed == self.current_thrust:
+            return True
+        
         try:
-            # Stop any existing throttle ramp thread
-            if self.throttle_thread and self.throttle_thread.is_alive():
-                self.throttle_thread_running = False
-                self.throttle_thread.join(timeout=0.5)  # Wait for it to stop, but don't block too long
-            
-            # Start new throttle thread
-            self.throttle_thread_running = True
-            self.throttle_thread = threading.Thread(
-                target=self._throttle_ramp_thread,
-                args=(speed, ramp_time, step_size),
-                daemon=True  # Make it a daemon so it doesn't prevent program exit
-            )
-            self.throttle_thread.start()
-            
+            # Hand the command to the ramp worker; it preempts any ramp in progress
+            self._throttle_target = speed
+            self._queue_throttle_command((speed, ramp_time, step_size))
             return True
         except Exception as e:
             logger.error(f"Error setting thrust: {e}")
@@ -285,43 +456,44 @@ class MotorController:
         """Stop PWM and release resources"""
         if self.initialized:
             try:
-                # Stop throttle ramping thread if it's running
+                # Stop the throttle ramp worker (interrupts any ramp in progress)
                 if self.throttle_thread and self.throttle_thread.is_alive():
-                    self.throttle_thread_running = False
+                    self._queue_throttle_command(None)
                     self.throttle_thread.join(timeout=1.0)
+                self.throttle_thread = None
                 
-                # Stop thruster immediately (no ramping during emergency stop)
-                if self.thrust_pwm:
-                    # Set neutral throttle position directly with no ramping
-                    with self.thrust_lock:
-                        duty_cycle = self.speed_to_duty_cycle(0)
-                        self.thrust_pwm.change_duty_cycle(duty_cycle)
+                # Neutralize thrust (no ramping during emergency stop) and center the rudder
+                # back-to-back under one lock, then let both outputs settle together
+                with self._pwm_lock:
+                    if self.thrust_pwm:
+                        self._thrust_writer.write_ns(self._speed_ns[100])
                         self.current_thrust = 0
-                        logger.info("Emergency stop: Thruster set to neutral position")
+                    if self.rudder_pwm:
+                        self._rudder_writer.write_ns(self._rudder_ns[135])
+                        self.current_rudder = 0
                 
-                # Set rudder to center position (0 degrees) before stopping PWM
+                if self.thrust_pwm:
+                    logger.info("Emergency stop: Thruster set to neutral position")
                 if self.rudder_pwm:
-                    with self.rudder_lock:
-                        duty_cycle = self.degrees_to_duty_cycle(0)
-                        self.rudder_pwm.change_duty_cycle(duty_cycle)
-                        self.current_rudder = 0
-                        logger.info("Emergency stop: Rudder set to center position")
-                        # Small delay to allow servo to reach position
-                        time.sleep(0.2)
+                    logger.info("Emergency stop: Rudder set to center position")
+                    # Small delay to allow servo to reach position
+                    time.sleep(0.2)
+                
+                # Release cached sysfs descriptors before the channels are stopped
+                for writer in (self._rudder_writer, self._thrust_writer):
+                    if writer:
+                        writer.close()
                 
                 # Stop PWM
                 if self.rudder_pwm:
                     self.rudder_pwm.stop()
-                    # Remove from global list
-                    global _global_pwm_instances
-                    if self.rudder_pwm in _global_pwm_instances:
-                        _global_pwm_instances.remove(self.rudder_pwm)
+                    # Remove from global registry
+                    _global_pwm_instances.pop(id(self.rudder_pwm), None)
                 
                 if self.thrust_pwm:
                     self.thrust_pwm.stop()
-                    # Remove from global list
-                    if self.thrust_pwm in _global_pwm_instances:
-                        _global_pwm_instances.remove(self.thrust_pwm)
+                    # Remove from global registry
+                    _global_pwm_instances.pop(id(self.thrust_pwm), None)
                     
                 self.initialized = False
                 logger.info("Boat motor control system shutdown complete")
@@ -331,7 +503,7 @@ class MotorController:
                 return False 
     
     def get_motor_status(self):
-        """Get current motor controller status"""
+        """Get current motor controller status (lock-free snapshot)"""
         return {
             'rudder_position': self.current_rudder,
             'throttle': self.current_thrust,
@@ -8,13 +8,50 @@ import math
 import time
 import logging
 import threading
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time as time_of_day
 from typing import Dict, Any, List, Optional, Tuple, Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field, asdict
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 from ..hardware.gps_handler import GPSHandler
 from ..hardware.motor_controller import MotorController
 
+# Earth radius in meters
+EARTH_RADIUS_M = 6371000
+
+# Forbidden zones are indexed on a lat/lon grid once there are enough of them
+# that scanning every zone each tick costs more than the index lookup
+GEOFENCE_INDEX_MIN_ZONES = 16
+GEOFENCE_GRID_CELL_RAD = math.radians(0.01)  # ~1.1 km cells
+GEOFENCE_GRID_MAX_CELLS_PER_ZONE = 400  # larger zones stay in the always-checked table
+
+# Fences up to this radius use a locally flat distance scaled at the mid latitude, which
+# stays within about a centimeter of Haversine up to 80 degrees latitude; larger fences
+# use full Haversine
+CHEAP_RULER_MAX_RADIUS_M = 5000.0
+
+
+def _haversine_rad(lat1_rad: float, lon1_rad: float, cos_lat1: float,
+                   lat2_rad: float, lon2_rad: float, cos_lat2: float) -> float:
+    """Haversine distance in meters from precomputed radians and latitude cosines"""
+    a = (math.sin((lat2_rad - lat1_rad) / 2)**2 +
+         cos_lat1 * cos_lat2 * math.sin((lon2_rad - lon1_rad) / 2)**2)
+    return EARTH_RADIUS_M * 2 * math.asin(math.sqrt(a))
+
+
+# Compile the geofence distance kernel to native code when Numba is installed
+if njit is not None:
+    _haversine_rad = njit(cache=True, fastmath=True)(_haversine_rad)
+
 
 @dataclass
 class GeofenceZone:
@@ -24,6 +61,20 @@ class GeofenceZone:
     center_lon: float
     radius_meters: float
     zone_type: str  # 'allowed' or 'forbidden'
+    
+    # Precomputed trig terms so geofence checks skip per-tick radians conversion
+    center_lat_rad: float = field(init=False, repr=False)
+    center_lon_rad: float = field(init=False, repr=False)
+    cos_center_lat: float = field(init=False, repr=False)
+    is_allowed: bool = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        if self.zone_type not in ('allowed', 'forbidden'):
+            raise ValueError(f"Invalid geofence zone type: {self.zone_type}")
+        self.is_allowed = self.zone_type == 'allowed'
+        self.center_lat_rad = math.radians(self.center_lat)
+        self.center_lon_rad = math.radians(self.center_lon)
+        self.cos_center_lat = math.cos(self.center_lat_rad)
 
 
 @dataclass
@@ -38,6 +89,17 @@ class SafetyLimits:
     command_timeout_seconds: int = 60
 
 
+@dataclass(slots=True)
+class ViolationCounts:
+    """Safety violation counters"""
+    speed_violations: int = 0
+    geofence_violations: int = 0
+    battery_violations: int = 0
+    temperature_violations: int = 0
+    gps_timeout_violations: int = 0
+    distance_violations: int = 0
+
+
 class SafetyMonitor:
     """
     Monitors boat safety parameters and enforces limits
@@ -56,34 +118,79 @@ class SafetyMonitor:
         # Monitoring state
         self.monitoring_active = False
         self.safety_thread = None
-        self.stop_monitoring = False
+        # Set to request loop exit; also wakes the loop out of its inter-check wait
+        self._stop_event = threading.Event()
         
         # Starting position for distance checks
         self.start_position: Optional[Tuple[float, float]] = None
+        self._start_position_rad: Optional[Tuple[float, float, float]] = None
         
         # Last known positions and timestamps
-        self.last_gps_update = None
-        self.last_command_time = None
+        # Monotonic timestamps: immune to NTP/wall-clock steps in timeout math
+        self.last_gps_update_mono: Optional[float] = None
+        self.last_command_time_mono: Optional[float] = None
         self.last_position = None
+        self._last_position_rad: Optional[Tuple[float, float, float]] = None
+        
+        # Newest fix pushed by the GPS handler while subscribed (replaces per-tick polling)
+        self._latest_gps: Optional[Dict[str, Any]] = None
+        self._gps_subscribed = False
+        
+        # Flattened fence rows walked by _check_geofence: the configured zones
+        # followed by the start-distance fence as a synthetic allowed zone
+        self._fence_table: List[Tuple[float, float, float, float, bool, Optional[GeofenceZone]]] = []
+        # Grid cell -> forbidden zone rows overlapping it (None while zones are few)
+        self._forbidden_grid: Optional[Dict[Tuple[int, int], List[Tuple]]] = None
         
         # Safety violation callbacks
         self.safety_callbacks: List[Callable[[str, str, Dict[str, Any]], None]] = []
         
-        # Emergency stop state
-        self.emergency_stop_active = False
+        # Emergency stop state (Event so readers on other threads never see a torn update)
+        self._emergency_stop_event = threading.Event()
+        
+        # Safety check intervals (adaptive between min and max once a fix is valid)
+        self.check_interval = 2.0  # seconds, used while there is no valid fix
+        self.min_check_interval = 0.25  # seconds, moving fast or near a boundary
+        self.max_check_interval = 5.0  # seconds, stationary with a valid fix
+        
+        # Seconds of travel held back from the boundary distance when sizing the interval,
+        # covering the GPS fix period and the wait until the next check
+        self.boundary_margin_seconds = 2.0
         
-        # Safety check intervals
-        self.check_interval = 2.0  # seconds
+        # Motion and boundary estimates driving the adaptive interval
+        self._last_fix_key = None  # GPS timestamp (or position) of the fix last ingested
+        self._last_fix_time: Optional[Tuple[bool, float]] = None  # (is GPS UTC time, seconds)
+        self._last_fix_mono: Optional[float] = None  # when that fix reached the monitor
+        self._last_speed_mps = 0.0
+        # Nearest boundary from this cycle's geofence check: inf with no fences,
+        # None when the check did not run
+        self._boundary_distance: Optional[float] = None
+        
+        # System health sampling (disk usage changes slowly, so it is refreshed less often)
+        self.disk_check_interval = 60.0  # seconds
+        self._last_disk_check: Optional[float] = None
+        self._cached_disk_percent = 0.0
+        # CPU usage is measured from the monitor's own cpu_times() samples, since
+        # psutil.cpu_percent(interval=None) shares one global baseline with every other caller
+        self._cpu_sample: Optional[Tuple[float, float, float]] = None  # (monotonic, busy, total)
+        self._cpu_percent = 0.0
         
         # Violation counters
-        self.violation_counts = {
-            'speed_violations': 0,
-            'geofence_violations': 0,
-            'battery_violations': 0,
-            'temperature_violations': 0,
-            'gps_timeout_violations': 0,
-            'distance_violations': 0
-        }
+        self.violation_counts = ViolationCounts()
+        # Held only while incrementing or snapshotting the counters
+        self._counts_lock = threading.Lock()
+    
+    @property
+    def emergency_stop_active(self) -> bool:
+        """Whether an emergency stop is currently in effect"""
+        return self._emergency_stop_event.is_set()
+    
+    @emergency_stop_active.setter
+    def emergency_stop_active(self, active: bool):
+        if active:
+            self._emergency_stop_event.set()
+        else:
+            self._emergency_stop_event.clear()
     
     def set_safety_limits(self, limits: Dict[str, Any]):
         """Update safety limits"""
@@ -93,10 +200,13 @@ class SafetyMonitor:
                 self.logger.info(f"Safety limit updated: {key} = {value}")
             else:
                 self.logger.warning(f"Unknown safety limit: {key}")
+        
+        self._rebuild_fence_table()
     
     def add_geofence_zone(self, zone: GeofenceZone):
         """Add a geofence zone"""
         self.geofence_zones.append(zone)
+        self._rebuild_fence_table()
         self.logger.info(f"Added geofence zone: {zone.name} ({zone.zone_type})")
     
     def remove_geofence_zone(self, zone_name: str) -> bool:
@@ -104,6 +214,7 @@ class SafetyMonitor:
         for i, zone in enumerate(self.geofence_zones):
             if zone.name == zone_name:
                 del self.geofence_zones[i]
+                self._rebuild_fence_table()
                 self.logger.info(f"Removed geofence zone: {zone_name}")
                 return True
         return False
@@ -111,6 +222,7 @@ class SafetyMonitor:
     def clear_geofence_zones(self):
         """Clear all geofence zones"""
         self.geofence_zones.clear()
+        self._rebuild_fence_table()
         self.logger.info("All geofence zones cleared")
     
     def add_safety_callback(self, callback: Callable[[str, str, Dict[str, Any]], None]):
@@ -125,6 +237,7 @@ class SafetyMonitor:
                 gps_data = self.gps_handler.get_position()
                 if gps_data and 'latitude' in gps_data and 'longitude' in gps_data:
                     self.start_position = (gps_data['latitude'], gps_data['longitude'])
+                    self._start_position_rad = self._position_to_rad(*self.start_position)
                     self.logger.info(f"Start position set to current GPS: {self.start_position}")
                 else:
                     self.logger.error("Cannot set start position - no GPS data available")
@@ -134,8 +247,10 @@ class SafetyMonitor:
                 return False
         else:
             self.start_position = (latitude, longitude)
+            self._start_position_rad = self._position_to_rad(latitude, longitude)
             self.logger.info(f"Start position set to: {self.start_position}")
         
+        self._rebuild_fence_table()
         return True
     
     def start_monitoring(self) -> bool:
@@ -150,8 +265,22 @@ class SafetyMonitor:
                 if not self.set_start_position():
                     self.logger.warning("Starting monitoring without start position")
             
+            # Compile (or load the cached) Numba kernel now, not inside the first live safety tick
+            if njit is not None:
+                self._haversine_rad(0.0, 0.0, 1.0, 0.0, 0.0, 1.0)
+            
+            # Take the CPU baseline so the first health check measures a real window
+            if psutil is not None:
+                self._cpu_sample = (time.monotonic(), *self._cpu_busy_total())
+            
+            # Receive fixes as they arrive instead of polling the GPS handler each tick
+            if hasattr(self.gps_handler, 'subscribe'):
+                self._latest_gps = None
+                self.gps_handler.subscribe(self._on_gps_update)
+                self._gps_subscribed = True
+            
             self.logger.info("Starting safety monitoring")
-            self.stop_monitoring = False
+            self._stop_event.clear()
             self.monitoring_active = True
             self.emergency_stop_active = False
             
@@ -170,12 +299,16 @@ class SafetyMonitor:
         """Stop safety monitoring"""
         self.logger.info("Stopping safety monitoring")
         
-        self.stop_monitoring = True
+        self._stop_event.set()
         self.monitoring_active = False
         
         if self.safety_thread and self.safety_thread.is_alive():
             self.safety_thread.join(timeout=3)
         
+        if self._gps_subscribed:
+            self.gps_handler.unsubscribe(self._on_gps_update)
+            self._gps_subscribed = False
+        
         self.logger.info("Safety monitoring stopped")
     
     def trigger_emergency_stop(self, reason: str = "Manual trigger") -> bool:
@@ -209,26 +342,30 @@ class SafetyMonitor:
             'timestamp': datetime.now().isoformat()
         }
         
+        # Unknown until this cycle's geofence check runs
+        self._boundary_distance = None
+        
         try:
-            # Check GPS availability
-            gps_check = self._check_gps_health()
-            if not gps_check['healthy']:
-                safety_status['violations'].append({
-                    'type': 'GPS_UNAVAILABLE',
-                    'message': gps_check['message']
-                })
-                safety_status['safe'] = False
-            
-            # Check motor status
-            motor_check = self._check_motor_health()
-            if not motor_check['healthy']:
-                safety_status['violations'].append({
-                    'type': 'MOTOR_ISSUE',
-                    'message': motor_check['message']
-                })
-                safety_status['safe'] = False
-            
-            # Check system health
+            # Critical checks ordered cheapest first. Any one of these violations
+            # mandates an emergency stop, so stop at the first failure. Geofence
+            # runs after GPS so it only sees a healthy position.
+            critical_checks = (
+                ('MOTOR_ISSUE', self._check_motor_health, 'healthy'),
+                ('GPS_UNAVAILABLE', self._check_gps_health, 'healthy'),
+                ('GEOFENCE_VIOLATION', self._check_geofence, 'compliant'),
+            )
+            
+            for violation_type, check, ok_key in critical_checks:
+                result = check()
+                if not result[ok_key]:
+                    safety_status['violations'].append({
+                        'type': violation_type,
+                        'message': result['message']
+                    })
+                    safety_status['safe'] = False
+                    return safety_status
+            
+            # Check system health (psutil syscalls) only on otherwise healthy ticks
             system_check = self._check_system_health()
             if not system_check['healthy']:
                 if system_check['critical']:
@@ -242,16 +379,6 @@ class SafetyMonitor:
                         'type': 'SYSTEM_WARNING',
                         'message': system_check['message']
                     })
-            
-            # Check geofence if GPS is available
-            if gps_check['healthy']:
-                geofence_check = self._check_geofence()
-                if not geofence_check['compliant']:
-                    safety_status['violations'].append({
-                        'type': 'GEOFENCE_VIOLATION',
-                        'message': geofence_check['message']
-                    })
-                    safety_status['safe'] = False
         
         except Exception as e:
             safety_status['violations'].append({
@@ -264,12 +391,15 @@ class SafetyMonitor:
     
     def get_status(self) -> Dict[str, Any]:
         """Get safety monitor status"""
+        with self._counts_lock:
+            violation_counts = asdict(self.violation_counts)
+        
         return {
             'monitoring_active': self.monitoring_active,
             'emergency_stop_active': self.emergency_stop_active,
             'start_position': self.start_position,
             'geofence_zones': len(self.geofence_zones),
-            'violation_counts': self.violation_counts.copy(),
+            'violation_counts': violation_counts,
             'safety_limits': {
                 'max_speed_percent': self.safety_limits.max_speed_percent,
                 'max_rudder_angle': self.safety_limits.max_rudder_angle,
@@ -278,50 +408,155 @@ class SafetyMonitor:
                 'temperature_max': self.safety_limits.temperature_max,
                 'gps_timeout_seconds': self.safety_limits.gps_timeout_seconds
             },
-            'last_gps_update': self.last_gps_update.isoformat() if self.last_gps_update else None,
-            'last_command_time': self.last_command_time.isoformat() if self.last_command_time else None
+            'last_gps_update': self._monotonic_to_iso(self.last_gps_update_mono),
+            'last_command_time': self._monotonic_to_iso(self.last_command_time_mono)
         }
     
     def update_command_time(self):
         """Update last command timestamp (called by command dispatcher)"""
-        self.last_command_time = datetime.now()
+        self.last_command_time_mono = time.monotonic()
+    
+    def run_safety_cycle(self) -> float:
+        """
+        Run one safety monitoring cycle and return the delay (seconds) until the next one.
+        Lets a shared scheduler drive safety checks alongside other periodic tasks.
+        """
+        try:
+            # Take in the newest fix first so the geofence check sees the current position
+            has_fix = self._ingest_gps_fix()
+            
+            # Perform safety checks
+            safety_check = self.check_immediate_safety()
+            
+            # Handle violations
+            if not safety_check['safe']:
+                for violation in safety_check['violations']:
+                    self._handle_safety_violation(violation['type'], violation['message'])
+            
+            return self._next_check_interval(has_fix)
+            
+        except Exception as e:
+            self.logger.error(f"Safety monitoring loop error: {e}")
+            return self.check_interval
     
     def _safety_monitoring_loop(self):
         """Main safety monitoring loop"""
         self.logger.info("Safety monitoring loop started")
         
-        while not self.stop_monitoring:
-            try:
-                # Perform safety checks
-                safety_check = self.check_immediate_safety()
-                
-                # Handle violations
-                if not safety_check['safe']:
-                    for violation in safety_check['violations']:
-                        self._handle_safety_violation(violation['type'], violation['message'])
-                
-                # Update GPS timestamp
-                try:
-                    gps_data = self.gps_handler.get_position()
-                    if gps_data:
-                        self.last_gps_update = datetime.now()
-                        if 'latitude' in gps_data and 'longitude' in gps_data:
-                            self.last_position = (gps_data['latitude'], gps_data['longitude'])
-                except:
-                    pass  # GPS errors are handled in check_immediate_safety
-                
-                time.sleep(self.check_interval)
-                
-            except Exception as e:
-                self.logger.error(f"Safety monitoring loop error: {e}")
-                time.sleep(self.check_interval)
+        # Schedule against a monotonic deadline so check duration doesn't stretch the period
+        deadline = time.monotonic()
+        while not self._stop_event.is_set():
+            deadline += self.run_safety_cycle()
+            now = time.monotonic()
+            if deadline < now:
+                # Overran the period; resync instead of bursting to catch up
+                deadline = now
+            self._stop_event.wait(deadline - now)
         
         self.logger.info("Safety monitoring loop stopped")
     
+    def _on_gps_update(self, gps_data: Dict[str, Any]):
+        """GPS handler callback: store the newest fix (runs on the GPS reader thread)"""
+        self._latest_gps = gps_data
+        self.last_gps_update_mono = time.monotonic()
+    
+    def _get_gps_snapshot(self) -> Optional[Dict[str, Any]]:
+        """Latest GPS data: the pushed snapshot while subscribed, otherwise a direct poll"""
+        if self._gps_subscribed:
+            return self._latest_gps
+        return self.gps_handler.get_position()
+    
+    def _ingest_gps_fix(self) -> bool:
+        """
+        Record the newest GPS position and, when it is a new fix, update the speed estimate.
+        Returns whether the position comes from a valid fix.
+        """
+        try:
+            gps_data = self._get_gps_snapshot()
+            if not gps_data:
+                return False
+            
+            # Update GPS timestamp (pushed fixes stamp themselves in _on_gps_update)
+            if not self._gps_subscribed:
+                self.last_gps_update_mono = time.monotonic()
+            
+            latitude = gps_data.get('latitude')
+            longitude = gps_data.get('longitude')
+            if latitude is None or longitude is None:
+                return False  # No fix yet, or fix lost; keep the last known position
+            
+            # Cycles can outpace the GPS; only a new fix moves the position or the speed
+            fix_key = gps_data.get('timestamp') or (latitude, longitude)
+            if fix_key != self._last_fix_key:
+                previous_position_rad = self._last_position_rad
+                # Convert once per fix (reused for every zone and start check), before
+                # touching any state so a bad fix can't leave the copies out of step
+                position_rad = self._position_to_rad(latitude, longitude)
+                self.last_position = (latitude, longitude)
+                self._last_position_rad = position_rad
+                self._last_fix_key = fix_key
+                self._last_fix_mono = self.last_gps_update_mono
+                self._update_speed_estimate(previous_position_rad, self._fix_time(gps_data))
+            
+            return bool(gps_data.get('has_fix', True))
+        except Exception:
+            return False  # GPS errors are reported by _check_gps_health
+    
+    def _fix_time(self, gps_data: Dict[str, Any]) -> Tuple[bool, float]:
+        """Time of a fix: (True, GPS UTC seconds of day) when stamped, else (False, arrival time)"""
+        stamp = gps_data.get('timestamp')
+        if stamp:
+            try:
+                t = time_of_day.fromisoformat(str(stamp))
+                return True, t.hour * 3600 + t.minute * 60 + t.second + t.microsecond / 1e6
+            except ValueError:
+                pass
+        return False, self._last_fix_mono
+    
+    def _update_speed_estimate(self, previous_position_rad: Optional[Tuple[float, float, float]],
+                               fix_time: Tuple[bool, float]):
+        """Estimate ground speed (m/s) from displacement between consecutive fixes"""
+        previous_fix_time = self._last_fix_time
+        self._last_fix_time = fix_time
+        
+        # Only compare times from the same clock
+        if not previous_position_rad or previous_fix_time is None or previous_fix_time[0] != fix_time[0]:
+            return
+        
+        elapsed = fix_time[1] - previous_fix_time[1]
+        if fix_time[0]:
+            elapsed %= 86400  # GPS time of day wraps at UTC midnight
+        if elapsed > 0:
+            moved = self._haversine_rad(*previous_position_rad, *self._last_position_rad)
+            self._last_speed_mps = moved / elapsed
+    
+    def _next_check_interval(self, has_fix: bool) -> float:
+        """
+        Pick the next safety check interval: fast when moving or near a geofence
+        boundary, slow when stationary. Capped so command timeouts stay responsive.
+        """
+        # Capped so a command timeout is still noticed within a quarter of its limit
+        ceiling = min(self.max_check_interval, self.safety_limits.command_timeout_seconds / 4)
+        
+        if not has_fix:
+            return min(self.check_interval, ceiling)
+        
+        if self._boundary_distance is None:
+            # An earlier check failed before the geofence ran; keep the fixed cadence
+            return min(self.check_interval, ceiling)
+        
+        # The boundary distance is as of the last fix: hold back the travel since then
+        # plus a margin before estimating when the boat could reach it
+        speed = self._last_speed_mps
+        fix_age = time.monotonic() - self._last_fix_mono if self._last_fix_mono is not None else 0.0
+        margin = speed * (fix_age + self.boundary_margin_seconds)
+        interval = (self._boundary_distance - margin) / max(speed, 0.1)
+        return max(self.min_check_interval, min(interval, ceiling))
+    
     def _check_gps_health(self) -> Dict[str, Any]:
         """Check GPS system health"""
         try:
-            gps_data = self.gps_handler.get_position()
+            gps_data = self._get_gps_snapshot()
             
             # Check if GPS data is available
             if not gps_data:
@@ -331,8 +566,8 @@ class SafetyMonitor:
                 }
             
             # Check GPS timeout
-            if self.last_gps_update:
-                time_since_update = (datetime.now() - self.last_gps_update).total_seconds()
+            if self.last_gps_update_mono is not None:
+                time_since_update = time.monotonic() - self.last_gps_update_mono
                 if time_since_update > self.safety_limits.gps_timeout_seconds:
                     return {
                         'healthy': False,
@@ -377,7 +612,8 @@ class SafetyMonitor:
             # Check battery voltage
             battery_voltage = motor_status.get('battery_voltage')
             if battery_voltage and battery_voltage < self.safety_limits.battery_voltage_min:
-                self.violation_counts['battery_violations'] += 1
+                with self._counts_lock:
+                    self.violation_counts.battery_violations += 1
                 return {
                     'healthy': False,
                     'message': f'Low battery voltage: {battery_voltage:.1f}V'
@@ -386,7 +622,8 @@ class SafetyMonitor:
             # Check temperature
             temperature = motor_status.get('temperature')
             if temperature and temperature > self.safety_limits.temperature_max:
-                self.violation_counts['temperature_violations'] += 1
+                with self._counts_lock:
+                    self.violation_counts.temperature_violations += 1
                 return {
                     'healthy': False,
                     'message': f'High temperature: {temperature:.1f}°C'
@@ -395,7 +632,8 @@ class SafetyMonitor:
             # Check speed limit
             throttle_percent = motor_status.get('throttle_percent', 0)
             if abs(throttle_percent) > self.safety_limits.max_speed_percent:
-                self.violation_counts['speed_violations'] += 1
+                with self._counts_lock:
+                    self.violation_counts.speed_violations += 1
                 return {
                     'healthy': False,
                     'message': f'Speed limit exceeded: {throttle_percent}%'
@@ -419,11 +657,19 @@ class SafetyMonitor:
     
     def _check_system_health(self) -> Dict[str, Any]:
         """Check system health (CPU, memory, etc.)"""
+        if psutil is None:
+            return {
+                'healthy': False,
+                'critical': False,
+                'message': 'System check unavailable: psutil not installed'
+            }
+        
         try:
-            import psutil
+            # Sample CPU (non-blocking delta since this monitor's last sample) and memory together
+            cpu_percent = self._sample_cpu_percent()
+            memory_percent = psutil.virtual_memory().percent
             
-            # Check CPU usage
-            cpu_percent = psutil.cpu_percent()
+            # Critical levels first
             if cpu_percent > 90:
                 return {
                     'healthy': False,
@@ -431,22 +677,24 @@ class SafetyMonitor:
                     'message': f'High CPU usage: {cpu_percent}%'
                 }
             
-            # Check memory usage
-            memory = psutil.virtual_memory()
-            if memory.percent > 90:
+            if memory_percent > 90:
                 return {
                     'healthy': False,
                     'critical': True,
-                    'message': f'High memory usage: {memory.percent}%'
+                    'message': f'High memory usage: {memory_percent}%'
                 }
             
-            # Check disk space
-            disk = psutil.disk_usage('/')
-            if disk.percent > 95:
+            # Check disk space (cached between refreshes)
+            now = time.monotonic()
+            if self._last_disk_check is None or now - self._last_disk_check > self.disk_check_interval:
+                self._cached_disk_percent = psutil.disk_usage('/').percent
+                self._last_disk_check = now
+            
+            if self._cached_disk_percent > 95:
                 return {
                     'healthy': False,
                     'critical': False,
-                    'message': f'Low disk space: {disk.percent}%'
+                    'message': f'Low disk space: {self._cached_disk_percent}%'
                 }
             
             # Warning levels
@@ -457,11 +705,11 @@ class SafetyMonitor:
                     'message': f'Elevated CPU usage: {cpu_percent}%'
                 }
             
-            if memory.percent > 80:
+            if memory_percent > 80:
                 return {
                     'healthy': False,
                     'critical': False,
-                    'message': f'High memory usage: {memory.percent}%'
+                    'message': f'High memory usage: {memory_percent}%'
                 }
             
             return {'healthy': True, 'message': 'System healthy'}
@@ -473,51 +721,104 @@ class SafetyMonitor:
                 'message': f'System check error: {e}'
             }
     
+    def _sample_cpu_percent(self) -> float:
+        """
+        CPU usage (%) since this monitor's previous sample. Samples closer together than
+        min_check_interval reuse the last value rather than measuring a tiny, noisy window.
+        """
+        now = time.monotonic()
+        previous = self._cpu_sample
+        if previous is not None and now - previous[0] < self.min_check_interval:
+            return self._cpu_percent
+        
+        busy, total = self._cpu_busy_total()
+        if previous is not None and total > previous[2]:
+            busy_delta = max(busy - previous[1], 0.0)
+            self._cpu_percent = round(min(100.0 * busy_delta / (total - previous[2]), 100.0), 1)
+        self._cpu_sample = (now, busy, total)
+        return self._cpu_percent
+    
+    @staticmethod
+    def _cpu_busy_total() -> Tuple[float, float]:
+        """(busy, total) CPU seconds across all cores, counted the way psutil.cpu_percent does"""
+        times = psutil.cpu_times()
+        # Guest time is already included in user time; iowait counts as idle
+        total = sum(times) - getattr(times, 'guest', 0.0) - getattr(times, 'guest_nice', 0.0)
+        idle = times.idle + getattr(times, 'iowait', 0.0)
+        return total - idle, total
+    
     def _check_geofence(self) -> Dict[str, Any]:
         """Check geofence compliance"""
-        if not self.geofence_zones or not self.last_position:
+        if not self.geofence_zones or not self._last_position_rad:
+            self._boundary_distance = math.inf if self._last_position_rad else None
             return {'compliant': True, 'message': 'No geofence zones or position'}
         
+        # Treat the boundary as reached until the check proves compliance
+        self._boundary_distance = 0.0
+        
         try:
-            current_lat, current_lon = self.last_position
-            
-            for zone in self.geofence_zones:
-                distance = self._calculate_distance(
-                    current_lat, current_lon,
-                    zone.center_lat, zone.center_lon
+            current_lat_rad, current_lon_rad, cos_current_lat = self._last_position_rad
+            nearest_boundary = float('inf')
+            fence_rows = self._fence_table
+            
+            forbidden_grid = self._forbidden_grid
+            if forbidden_grid is not None:
+                # Only forbidden zones overlapping the current cell can contain the boat;
+                # every other indexed zone lies beyond the cell edge
+                cell_lat = math.floor(current_lat_rad / GEOFENCE_GRID_CELL_RAD)
+                cell_lon = math.floor(current_lon_rad / GEOFENCE_GRID_CELL_RAD)
+                fence_rows = fence_rows + forbidden_grid.get((cell_lat, cell_lon), [])
+                
+                lat_offset = current_lat_rad - cell_lat * GEOFENCE_GRID_CELL_RAD
+                lon_offset = current_lon_rad - cell_lon * GEOFENCE_GRID_CELL_RAD
+                nearest_boundary = EARTH_RADIUS_M * min(
+                    lat_offset, GEOFENCE_GRID_CELL_RAD - lat_offset,
+                    cos_current_lat * min(lon_offset, GEOFENCE_GRID_CELL_RAD - lon_offset)
                 )
+            
+            # Single pass over zones and the start fence (zone is None for the start fence)
+            for lat_rad, lon_rad, cos_lat, radius, is_allowed, zone in fence_rows:
+                if radius <= CHEAP_RULER_MAX_RADIUS_M:
+                    delta_lon = lon_rad - current_lon_rad
+                    if abs(delta_lon) > math.pi:
+                        delta_lon -= math.copysign(2 * math.pi, delta_lon)
+                    meters_per_rad_lon = EARTH_RADIUS_M * math.cos((lat_rad + current_lat_rad) / 2)
+                    distance = math.hypot(delta_lon * meters_per_rad_lon,
+                                          (lat_rad - current_lat_rad) * EARTH_RADIUS_M)
+                else:
+                    distance = self._haversine_rad(
+                        current_lat_rad, current_lon_rad, cos_current_lat,
+                        lat_rad, lon_rad, cos_lat
+                    )
+                nearest_boundary = min(nearest_boundary, abs(radius - distance))
                 
-                if zone.zone_type == 'allowed':
+                if is_allowed:
                     # Must be inside allowed zone
-                    if distance > zone.radius_meters:
-                        self.violation_counts['geofence_violations'] += 1
+                    if distance > radius:
+                        if zone is None:
+                            with self._counts_lock:
+                                self.violation_counts.distance_violations += 1
+                            return {
+                                'compliant': False,
+                                'message': f'Too far from start: {distance:.1f}m'
+                            }
+                        with self._counts_lock:
+                            self.violation_counts.geofence_violations += 1
                         return {
                             'compliant': False,
                             'message': f'Outside allowed zone "{zone.name}": {distance:.1f}m from center'
                         }
-                elif zone.zone_type == 'forbidden':
+                else:
                     # Must not be in forbidden zone
-                    if distance <= zone.radius_meters:
-                        self.violation_counts['geofence_violations'] += 1
+                    if distance <= radius:
+                        with self._counts_lock:
+                            self.violation_counts.geofence_violations += 1
                         return {
                             'compliant': False,
                             'message': f'Inside forbidden zone "{zone.name}": {distance:.1f}m from center'
                         }
             
-            # Check distance from start position
-            if self.start_position:
-                start_distance = self._calculate_distance(
-                    current_lat, current_lon,
-                    self.start_position[0], self.start_position[1]
-                )
-                
-                if start_distance > self.safety_limits.max_distance_from_start:
-                    self.violation_counts['distance_violations'] += 1
-                    return {
-                        'compliant': False,
-                        'message': f'Too far from start: {start_distance:.1f}m'
-                    }
-            
+            self._boundary_distance = nearest_boundary
             return {'compliant': True, 'message': 'Geofence compliant'}
             
         except Exception as e:
@@ -526,6 +827,55 @@ class SafetyMonitor:
                 'message': f'Geofence check error: {e}'
             }
     
+    def _rebuild_fence_table(self):
+        """Rebuild the fence rows after zones, start position or limits change"""
+        table = [
+            (zone.center_lat_rad, zone.center_lon_rad, zone.cos_center_lat,
+             zone.radius_meters, zone.is_allowed, zone)
+            for zone in self.geofence_zones
+        ]
+        
+        forbidden_grid = None
+        if sum(1 for zone in self.geofence_zones if not zone.is_allowed) >= GEOFENCE_INDEX_MIN_ZONES:
+            forbidden_grid = {}
+            unindexed = []
+            for row in table:
+                if row[4] or not self._index_forbidden_row(forbidden_grid, row):
+                    unindexed.append(row)
+            table = unindexed
+        
+        if self._start_position_rad:
+            table.append((*self._start_position_rad,
+                          self.safety_limits.max_distance_from_start, True, None))
+        # Swap in new objects so a concurrent check never sees a partial table
+        self._fence_table = table
+        self._forbidden_grid = forbidden_grid
+    
+    @staticmethod
+    def _index_forbidden_row(grid: Dict[Tuple[int, int], List[Tuple]], row: Tuple) -> bool:
+        """Add a forbidden zone row to every grid cell its bounding box overlaps"""
+        lat_rad, lon_rad, cos_lat, radius = row[:4]
+        if cos_lat < 1e-6:
+            return False
+        
+        delta_lat = radius / EARTH_RADIUS_M
+        delta_lon = delta_lat / cos_lat
+        # Cells don't wrap at the antimeridian, so a zone crossing ±180° stays in the
+        # always-checked table rather than being indexed on one side only
+        if lon_rad - delta_lon < -math.pi or lon_rad + delta_lon > math.pi:
+            return False
+        lat_cells = range(math.floor((lat_rad - delta_lat) / GEOFENCE_GRID_CELL_RAD),
+                          math.floor((lat_rad + delta_lat) / GEOFENCE_GRID_CELL_RAD) + 1)
+        lon_cells = range(math.floor((lon_rad - delta_lon) / GEOFENCE_GRID_CELL_RAD),
+                          math.floor((lon_rad + delta_lon) / GEOFENCE_GRID_CELL_RAD) + 1)
+        if len(lat_cells) * len(lon_cells) > GEOFENCE_GRID_MAX_CELLS_PER_ZONE:
+            return False
+        
+        for cell_lat in lat_cells:
+            for cell_lon in lon_cells:
+                grid.setdefault((cell_lat, cell_lon), []).append(row)
+        return True
+    
     def _handle_safety_violation(self, violation_type: str, message: str):
         """Handle safety violation"""
         self.logger.warning(f"Safety violation: {violation_type} - {message}")
@@ -559,23 +909,18 @@ class SafetyMonitor:
             except Exception as e:
                 self.logger.error(f"Safety callback error: {e}")
     
-    def _calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Calculate distance between two GPS coordinates (Haversine formula)"""
-        # Convert to radians
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-        
-        # Haversine formula
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = (math.sin(dlat/2)**2 + 
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2)
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Earth radius in meters
-        earth_radius = 6371000
-        
-        return earth_radius * c
\ No newline at end of file
+    @staticmethod
+    def _monotonic_to_iso(mono_time: Optional[float]) -> Optional[str]:
+        """Convert a time.monotonic() timestamp to a wall-clock ISO string for reporting"""
+        if mono_time is None:
+            return None
+        return datetime.fromtimestamp(time.time() - (time.monotonic() - mono_time)).isoformat()
+    
+    @staticmethod
+    def _position_to_rad(latitude: float, longitude: float) -> Tuple[float, float, float]:
+        """Convert a position to (lat_rad, lon_rad, cos(lat_rad)) for _haversine_rad"""
+        lat_rad = math.radians(latitude)
+        return (lat_rad, math.radians(longitude), math.cos(lat_rad))
+    
+    # Module-level kernel (Numba-compiled when available)
+    _haversine_rad = staticmethod(_haversine_rad)
\ No newline at end of file
@@ -7,11 +7,13 @@ Simulates boat behavior for testing without real hardware
 import os
 import sys
 import json
+import math
 import time
 import uuid
 import logging
 import argparse
 import threading
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, Any, Optional
 
@@ -21,6 +23,69 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import paho.mqtt.client as mqtt
 from boat.config.mqtt_config import ConfigManager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# High-rate, idempotent telemetry is sent at QoS 0 (the next update supersedes a lost one);
+# acks keep the configured QoS
+TELEMETRY_TOPICS = frozenset({'status', 'gps', 'heartbeat', 'logs'})
+
+# Approximate meters per degree of latitude, and its reciprocal for the position update
+_METERS_PER_DEG = 111320.0
+_INV_METERS_PER_DEG = 1.0 / _METERS_PER_DEG
+
+# Per-second retention factors of the simulator's speed model: half the gap to the
+# throttle's target speed closes each second, and coasting keeps 90% of its speed
+_SPEED_ERROR_RETAINED_PER_S = 0.5
+_SPEED_ERROR_DECAY_RATE = -math.log(_SPEED_ERROR_RETAINED_PER_S)
+_DRAG_RETAINED_PER_S = 0.9
+
+
+# Reused encoder for the stdlib fallback. Every payload is built from JSON-native values
+# (timestamps are already ISO strings), so there is no default= fallback: a stray
+# non-JSON value raises at the publish site instead of being silently stringified
+_JSON_ENCODER = json.JSONEncoder()
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj to UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse UTF-8 JSON bytes without an intermediate str, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
+class BoatState:
+    """
+    Simulated boat state (one boat per simulator process, so plain slotted scalars
+    rather than an array layout)
+    """
+    lat: float = 40.7128  # Start at NYC
+    lon: float = -74.0060
+    heading: float = 0.0  # North
+    speed: float = 0.0  # m/s
+    throttle_percent: float = 0
+    rudder_angle: float = 0.0
+    battery_voltage: float = 12.5
+    temperature: float = 25.0
+    motor_running: bool = False
+    emergency_stop: bool = False
+    navigation_mode: str = 'idle'
+    
+    @property
+    def position(self) -> Dict[str, float]:
+        """Current position as a new {'lat', 'lon'} dict"""
+        return {'lat': self.lat, 'lon': self.lon}
+
 
 class BoatSimulator:
     """
@@ -28,9 +93,13 @@ class BoatSimulator:
     Responds to MQTT commands and publishes realistic telemetry
     """
     
-    def __init__(self, config_file: Optional[str] = None, boat_id: Optional[str] = None):
+    def __init__(self, config_file: Optional[str] = None, boat_id: Optional[str] = None,
+                 mqtt_log_level: int = logging.INFO):
         self.logger = self._setup_logging()
         
+        # Log messages below this level are not published to the logs topic
+        self._mqtt_log_min_level = mqtt_log_level
+        
         # Load configuration
         try:
             self.config_manager = ConfigManager(config_file)
@@ -45,21 +114,17 @@ class BoatSimulator:
         
         # MQTT client
         self.client = mqtt.Client(client_id=f"sim_{self.config.boat_id}_{int(time.time())}")
+        # Room for QoS>0 bursts without blocking publishes; back off reconnects up to 30s.
+        # paho's own log goes to our logger (visible with --verbose) to show queue build-up.
+        self.client.max_inflight_messages_set(200)
+        self.client.max_queued_messages_set(10000)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+        self.client.enable_logger(self.logger)
         self.connected = False
+        self._connected_event = threading.Event()  # Set by _on_connect once the broker accepts us
         
         # Simulated boat state
-        self.boat_state = {
-            'position': {'lat': 40.7128, 'lon': -74.0060},  # Start at NYC
-            'heading': 0.0,  # North
-            'speed': 0.0,  # m/s
-            'throttle_percent': 0,
-            'rudder_angle': 0.0,
-            'battery_voltage': 12.5,
-            'temperature': 25.0,
-            'motor_running': False,
-            'emergency_stop': False,
-            'navigation_mode': 'idle'
-        }
+        self.state = BoatState()
         
         # Navigation state
         self.waypoint_target = None
@@ -78,10 +143,37 @@ class BoatSimulator:
             'heartbeat': f"boat/{self.config.boat_id}/heartbeat"
         }
         
+        # Topic and QoS per topic key, resolved once (telemetry at QoS 0, see TELEMETRY_TOPICS).
+        # Topics stay str: paho-mqtt 2.x calls topic.encode() itself and rejects bytes.
+        self._boat_id = self.config.boat_id
+        self._publish_params = {
+            key: (topic, 0 if key in TELEMETRY_TOPICS else self.config.mqtt.qos)
+            for key, topic in self.topics.items()
+        }
+        
+        # Inbound topic -> handler, so routing a message is one dict lookup
+        self._topic_handlers = {
+            self.topics['commands']: self._handle_command,
+            self.topics['config']: self._handle_config,
+            self.topics['emergency']: self._handle_command
+        }
+        
+        # Constant JSON envelope prefix per topic; only the timestamp and data vary per publish
+        boat_id_json = json.dumps(self.config.boat_id)
+        self._msg_prefix = {
+            key: f'{{"boat_id": {boat_id_json}, "type": "{key}_update", "timestamp": "'.encode('utf-8')
+            for key in self.topics
+        }
+        
         # Simulation parameters
         self.simulation_active = False
         self.simulation_thread = None
         self.update_interval = 1.0  # seconds
+        self._stop_event = threading.Event()  # Wakes the simulation loop for shutdown
+        # Guards self.state between the simulation loop and MQTT command handlers; the
+        # physics is brought up to date under it before any command changes the state
+        self._state_lock = threading.Lock()
+        self._last_physics_time = time.monotonic()
         
         # Setup MQTT callbacks
         self.client.on_connect = self._on_connect
@@ -99,6 +191,7 @@ class BoatSimulator:
             
             # Start simulation loop
             self.simulation_active = True
+            self._stop_event.clear()
             self.simulation_thread = threading.Thread(target=self._simulation_loop, daemon=True)
             self.simulation_thread.start()
             
@@ -108,7 +201,7 @@ class BoatSimulator:
             self._publish_log("INFO", "Simulator started", {
                 'boat_id': self.config.boat_id,
                 'version': '2.0.0_sim',
-                'initial_position': self.boat_state['position']
+                'initial_position': self.state.position
             })
             
             return True
@@ -122,17 +215,22 @@ class BoatSimulator:
         self.logger.info("Stopping boat simulation...")
         
         self.simulation_active = False
+        self._stop_event.set()
         
         if self.simulation_thread and self.simulation_thread.is_alive():
             self.simulation_thread.join(timeout=2)
         
-        # Publish shutdown message
+        # Publish shutdown message and wait until paho has actually sent it
         if self.connected:
-            self._publish_log("INFO", "Simulator stopping", {
+            info = self._publish_log("INFO", "Simulator stopping", {
                 'boat_id': self.config.boat_id,
-                'final_position': self.boat_state['position']
+                'final_position': self.state.position
             })
-            time.sleep(0.5)  # Give time for message to send
+            if info is not None:
+                try:
+                    info.wait_for_publish(timeout=2.0)
+                except Exception as e:
+                    self.logger.warning(f"Shutdown message not confirmed: {e}")
         
         # Disconnect MQTT
         if self.client:
@@ -165,13 +263,12 @@ class BoatSimulator:
             )
             
             if result == mqtt.MQTT_ERR_SUCCESS:
+                # paho's own network thread keeps keepalives, reconnects and inbound commands
+                # independent of the simulation loop, which sleeps until the next publish is due
                 self.client.loop_start()
                 
-                # Wait for connection
-                timeout = 10
-                start_time = time.time()
-                while not self.connected and (time.time() - start_time) < timeout:
-                    time.sleep(0.1)
+                # Wait for connection (wakes as soon as _on_connect fires)
+                self._connected_event.wait(timeout=10)
                 
                 return self.connected
             else:
@@ -186,129 +283,163 @@ class BoatSimulator:
         """Main simulation loop"""
         self.logger.info("Simulation loop started")
         
-        last_status_time = 0
-        last_gps_time = 0
-        last_heartbeat_time = 0
+        # Scheduling uses the monotonic clock so wall-clock (NTP) steps can't stall or burst it
+        last_status_time = -math.inf
+        last_gps_time = -math.inf
+        last_heartbeat_time = -math.inf
         
         status_interval = 10  # seconds
         gps_interval = 5     # seconds
         heartbeat_interval = 30  # seconds
         
-        while self.simulation_active:
+        with self._state_lock:
+            self._last_physics_time = time.monotonic()
+        
+        while not self._stop_event.is_set():
             try:
-                current_time = time.time()
-                
-                # Update boat physics
-                self._update_boat_physics()
-                
-                # Publish periodic messages
-                if current_time - last_status_time >= status_interval:
-                    self._publish_status()
-                    last_status_time = current_time
+                current_time = time.monotonic()
+                # One wall-clock reading and timestamp string for every message published this tick
+                now = time.time()
+                now_iso = datetime.fromtimestamp(now).isoformat()
                 
-                if current_time - last_gps_time >= gps_interval:
-                    self._publish_gps_data()
-                    last_gps_time = current_time
+                # Collect the periodic messages due this tick and publish them in one flush
+                outbox = []
+                with self._state_lock:
+                    # Bring the boat physics up to date over the time actually elapsed
+                    self._sync_physics()
+                    
+                    if current_time - last_status_time >= status_interval:
+                        outbox.append(('status', self._build_status(now, now_iso)))
+                        last_status_time = current_time
+                    
+                    if current_time - last_gps_time >= gps_interval:
+                        outbox.append(('gps', self._build_gps_data(now_iso)))
+                        last_gps_time = current_time
+                    
+                    if current_time - last_heartbeat_time >= heartbeat_interval:
+                        outbox.append(('heartbeat', self._build_heartbeat(now, now_iso)))
+                        last_heartbeat_time = current_time
                 
-                if current_time - last_heartbeat_time >= heartbeat_interval:
-                    self._publish_heartbeat()
-                    last_heartbeat_time = current_time
+                if outbox:
+                    self._publish_batch(outbox, now_iso)
                 
-                time.sleep(self.update_interval)
+                # Sleep until the next message is due; nothing is observable in between
+                next_deadline = min(last_status_time + status_interval,
+                                    last_gps_time + gps_interval,
+                                    last_heartbeat_time + heartbeat_interval)
+                self._stop_event.wait(max(0, next_deadline - time.monotonic()))
                 
             except Exception as e:
                 self.logger.error(f"Simulation loop error: {e}")
-                time.sleep(1)
+                self._stop_event.wait(1)
         
         self.logger.info("Simulation loop stopped")
     
-    def _update_boat_physics(self):
-        """Update simulated boat physics"""
-        dt = self.update_interval
+    def _sync_physics(self):
+        """Advance the physics to now; call with _state_lock held"""
+        now = time.monotonic()
+        self._advance_physics(now - self._last_physics_time)
+        self._last_physics_time = now
+    
+    def _advance_physics(self, elapsed: float):
+        """Advance the physics by elapsed seconds, in steps of at most update_interval"""
+        # Speed is closed form, but a turn is followed as a chord per step, so long
+        # gaps between wakes are split into short steps
+        while elapsed > 0:
+            dt = min(elapsed, self.update_interval)
+            self._update_boat_physics(dt)
+            elapsed -= dt
+    
+    def _update_boat_physics(self, dt: Optional[float] = None):
+        """Update simulated boat physics over dt seconds (default: one update_interval)"""
+        if dt is None:
+            dt = self.update_interval
+        state = self.state
+        
+        # Fully at rest (motor off, stopped, cooled down): every update below would be a no-op
+        if not state.motor_running and state.speed == 0 and state.temperature <= 20.0:
+            return
         
         # Simple physics simulation
-        if not self.boat_state['emergency_stop'] and self.boat_state['motor_running']:
+        if not state.emergency_stop and state.motor_running:
             # Convert throttle to speed (very simple model)
             max_speed = 5.0  # m/s (about 10 knots)
-            target_speed = (self.boat_state['throttle_percent'] / 100.0) * max_speed
+            target_speed = (state.throttle_percent / 100.0) * max_speed
+            
+            # Simple acceleration: the speed error decays geometrically (halves every
+            # second), solved in closed form so any dt gives the same trajectory
+            speed_error = state.speed - target_speed
+            retained = _SPEED_ERROR_RETAINED_PER_S ** dt
+            speed = target_speed + speed_error * retained
+            state.speed = speed
             
-            # Simple acceleration
-            speed_diff = target_speed - self.boat_state['speed']
-            acceleration = speed_diff * 0.5  # Simple damping
-            self.boat_state['speed'] += acceleration * dt
+            # Update heading based on rudder; the step's chord runs along the mean heading
+            course = state.heading
+            if speed > 0.1:  # Only turn if moving
+                turn = state.rudder_angle * 2.0 * dt  # 2 degrees per second per degree of rudder
+                course = state.heading + turn / 2
+                state.heading = (state.heading + turn) % 360
             
-            # Update heading based on rudder
-            if self.boat_state['speed'] > 0.1:  # Only turn if moving
-                turn_rate = self.boat_state['rudder_angle'] * 2.0  # degrees per second
-                self.boat_state['heading'] += turn_rate * dt
-                self.boat_state['heading'] = self.boat_state['heading'] % 360
+            # Distance moved in meters: the exact integral of the speed curve over dt
+            distance = target_speed * dt + speed_error * (1.0 - retained) / _SPEED_ERROR_DECAY_RATE
             
             # Update position based on speed and heading
-            if self.boat_state['speed'] > 0:
+            if distance > 0:
                 # Convert to lat/lon movement (very approximate)
-                import math
-                
-                heading_rad = math.radians(self.boat_state['heading'])
-                
-                # Distance moved in meters
-                distance = self.boat_state['speed'] * dt
+                heading_rad = math.radians(course)
                 
                 # Convert to lat/lon (approximate)
-                lat_change = (distance * math.cos(heading_rad)) / 111320  # meters per degree lat
-                lon_change = (distance * math.sin(heading_rad)) / (111320 * math.cos(math.radians(self.boat_state['position']['lat'])))
+                lat_change = distance * math.cos(heading_rad) * _INV_METERS_PER_DEG
+                lon_change = distance * math.sin(heading_rad) * _INV_METERS_PER_DEG / math.cos(math.radians(state.lat))
                 
-                self.boat_state['position']['lat'] += lat_change
-                self.boat_state['position']['lon'] += lon_change
+                state.lat += lat_change
+                state.lon += lon_change
         else:
             # Gradually stop if emergency stop or motor off
-            self.boat_state['speed'] *= 0.9  # Drag
-            if self.boat_state['speed'] < 0.01:
-                self.boat_state['speed'] = 0
-        
-        # Update battery (simple discharge model)
-        if self.boat_state['motor_running'] and self.boat_state['throttle_percent'] > 0:
-            discharge_rate = 0.001 * (self.boat_state['throttle_percent'] / 100.0)
-            self.boat_state['battery_voltage'] -= discharge_rate * dt
-            self.boat_state['battery_voltage'] = max(10.0, self.boat_state['battery_voltage'])
-        
-        # Update temperature (motor heating)
-        if self.boat_state['motor_running'] and self.boat_state['throttle_percent'] > 0:
-            heating_rate = 0.1 * (self.boat_state['throttle_percent'] / 100.0)
-            self.boat_state['temperature'] += heating_rate * dt
+            state.speed *= _DRAG_RETAINED_PER_S ** dt  # Drag
+            if state.speed < 0.01:
+                state.speed = 0
+        
+        if state.motor_running and state.throttle_percent > 0:
+            throttle_fraction = state.throttle_percent / 100.0
+            
+            # Update battery (simple discharge model)
+            state.battery_voltage = max(10.0, state.battery_voltage - 0.001 * throttle_fraction * dt)
+            
+            # Update temperature (motor heating)
+            state.temperature += 0.1 * throttle_fraction * dt
         else:
             # Cooling
-            cooling_rate = 0.05
-            self.boat_state['temperature'] -= cooling_rate * dt
-            self.boat_state['temperature'] = max(20.0, self.boat_state['temperature'])
+            state.temperature = max(20.0, state.temperature - 0.05 * dt)
     
-    def _publish_status(self):
-        """Publish status message"""
+    def _build_status(self, now: float, now_iso: str) -> Dict[str, Any]:
+        """Build status message data"""
         status_data = {
-            'timestamp': datetime.now().isoformat(),
-            'uptime_seconds': time.time(),
+            'timestamp': now_iso,
+            'uptime_seconds': now,
             'reporting_active': True,
             'error_counts': {'gps_errors': 0, 'motor_errors': 0, 'mqtt_errors': 0},
             'gps': {
-                'latitude': self.boat_state['position']['lat'],
-                'longitude': self.boat_state['position']['lon'],
-                'speed': self.boat_state['speed'],
-                'heading': self.boat_state['heading'],
+                'latitude': self.state.lat,
+                'longitude': self.state.lon,
+                'speed': self.state.speed,
+                'heading': self.state.heading,
                 'satellites': 8,
                 'fix_quality': 1,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': now_iso
             },
             'motors': {
-                'throttle_percent': self.boat_state['throttle_percent'],
-                'rudder_angle': self.boat_state['rudder_angle'],
-                'motor_running': self.boat_state['motor_running'],
-                'current_heading': self.boat_state['heading'],
-                'battery_voltage': self.boat_state['battery_voltage'],
-                'temperature': self.boat_state['temperature'],
-                'timestamp': datetime.now().isoformat()
+                'throttle_percent': self.state.throttle_percent,
+                'rudder_angle': self.state.rudder_angle,
+                'motor_running': self.state.motor_running,
+                'current_heading': self.state.heading,
+                'battery_voltage': self.state.battery_voltage,
+                'temperature': self.state.temperature,
+                'timestamp': now_iso
             },
             'navigation': {
-                'mode': self.boat_state['navigation_mode'],
-                'timestamp': datetime.now().isoformat()
+                'mode': self.state.navigation_mode,
+                'timestamp': now_iso
             },
             'mqtt': {
                 'connected': self.connected,
@@ -319,52 +450,56 @@ class BoatSimulator:
         if self.waypoint_target:
             status_data['navigation']['waypoint'] = self.waypoint_target
         
-        self._publish_message('status', status_data)
+        return status_data
     
-    def _publish_gps_data(self):
-        """Publish GPS data"""
+    def _build_gps_data(self, now_iso: str) -> Dict[str, Any]:
+        """Build GPS message data"""
         gps_data = {
-            'latitude': self.boat_state['position']['lat'],
-            'longitude': self.boat_state['position']['lon'],
+            'latitude': self.state.lat,
+            'longitude': self.state.lon,
             'altitude': 5.0,
-            'speed': self.boat_state['speed'],
-            'heading': self.boat_state['heading'],
+            'speed': self.state.speed,
+            'heading': self.state.heading,
             'accuracy': 3.0,
             'satellites': 8,
             'fix_quality': 1,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now_iso
         }
         
-        self._publish_message('gps', gps_data)
+        return gps_data
     
-    def _publish_heartbeat(self):
-        """Publish heartbeat message"""
+    def _build_heartbeat(self, now: float, now_iso: str) -> Dict[str, Any]:
+        """Build heartbeat message data"""
         heartbeat_data = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now_iso,
             'boat_id': self.config.boat_id,
             'status': 'alive',
-            'uptime': time.time()
+            'uptime': now
         }
         
-        self._publish_message('heartbeat', heartbeat_data)
+        return heartbeat_data
+    
+    def _publish_batch(self, messages, now_iso: str):
+        """Publish a tick's worth of (topic_key, data) messages back-to-back"""
+        if not self.connected:
+            return
+        
+        for topic_key, data in messages:
+            self._publish_message(topic_key, data, now_iso)
     
-    def _publish_message(self, topic_key: str, data: Dict[str, Any]):
+    def _publish_message(self, topic_key: str, data: Dict[str, Any], now_iso: Optional[str] = None):
         """Publish message to MQTT"""
         if not self.connected:
             return
         
         try:
-            message = {
-                'timestamp': datetime.now().isoformat(),
-                'boat_id': self.config.boat_id,
-                'type': f'{topic_key}_update',
-                'data': data
-            }
+            if now_iso is None:
+                now_iso = datetime.now().isoformat()
+            topic, qos = self._publish_params[topic_key]
+            payload = (self._msg_prefix[topic_key] + now_iso.encode('ascii')
+                       + b'", "data": ' + _json_bytes(data) + b'}')
             
-            topic = self.topics[topic_key]
-            payload = json.dumps(message, default=str)
-            
-            result = self.client.publish(topic, payload, qos=self.config.mqtt.qos)
+            result = self.client.publish(topic, payload, qos=qos)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
                 self.logger.debug(f"Published {topic_key} message")
@@ -378,17 +513,17 @@ class BoatSimulator:
         """Publish command acknowledgment"""
         ack_data = {
             'timestamp': datetime.now().isoformat(),
-            'boat_id': self.config.boat_id,
+            'boat_id': self._boat_id,
             'command_id': command_id,
             'success': success,
             'message': message
         }
         
         try:
-            topic = self.topics['ack']
-            payload = json.dumps(ack_data)
+            topic, qos = self._publish_params['ack']
+            payload = _json_bytes(ack_data)
             
-            result = self.client.publish(topic, payload, qos=self.config.mqtt.qos)
+            result = self.client.publish(topic, payload, qos=qos)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
                 self.logger.debug(f"Published ACK for {command_id}")
@@ -399,28 +534,38 @@ class BoatSimulator:
             self.logger.error(f"ACK publish error: {e}")
     
     def _publish_log(self, level: str, message: str, details: Dict[str, Any] = None):
-        """Publish log message"""
+        """Publish log message; returns paho's MQTTMessageInfo, or None if nothing was queued"""
+        # Filtered levels are dropped before any formatting or serialization
+        level_no = logging.getLevelName(level)
+        if isinstance(level_no, int) and level_no < self._mqtt_log_min_level:
+            return
+        
         log_data = {
             'timestamp': datetime.now().isoformat(),
-            'boat_id': self.config.boat_id,
+            'boat_id': self._boat_id,
             'level': level,
             'message': message,
             'details': details or {}
         }
         
         try:
-            topic = self.topics['logs']
-            payload = json.dumps(log_data)
+            topic, qos = self._publish_params['logs']
+            payload = _json_bytes(log_data)
+            # Critical events (emergency stop) keep delivery guarantees; routine logs are telemetry
+            if level == "CRITICAL":
+                qos = self.config.mqtt.qos
             
-            result = self.client.publish(topic, payload, qos=self.config.mqtt.qos)
+            result = self.client.publish(topic, payload, qos=qos)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
                 self.logger.debug(f"Published log: {message}")
+                return result
             else:
                 self.logger.warning(f"Failed to publish log: {message}")
                 
         except Exception as e:
             self.logger.error(f"Log publish error: {e}")
+        return None
     
     def _handle_command(self, command: Dict[str, Any]):
         """Handle incoming command"""
@@ -472,7 +617,7 @@ class BoatSimulator:
                 'arrival_radius': payload.get('arrival_radius', 10.0)
             }
             
-            self.boat_state['navigation_mode'] = 'waypoint'
+            self.state.navigation_mode = 'waypoint'
             return True, f"Waypoint set to {lat}, {lon}"
             
         elif action == 'set_course':
@@ -486,15 +631,15 @@ class BoatSimulator:
                 'duration': duration
             }
             
-            self.boat_state['navigation_mode'] = 'course'
-            self.boat_state['throttle_percent'] = speed
-            self.boat_state['motor_running'] = True
+            self.state.navigation_mode = 'course'
+            self.state.throttle_percent = speed
+            self.state.motor_running = True
             
             return True, f"Course set to {heading}° at {speed}%"
             
         elif action == 'hold_position':
-            self.position_hold_target = self.boat_state['position'].copy()
-            self.boat_state['navigation_mode'] = 'hold_position'
+            self.position_hold_target = self.state.position
+            self.state.navigation_mode = 'hold_position'
             
             return True, "Position hold engaged"
         
@@ -506,20 +651,20 @@ class BoatSimulator:
         
         if action == 'set_rudder':
             angle = payload.get('angle', 0)
-            self.boat_state['rudder_angle'] = max(-45, min(45, angle))
-            return True, f"Rudder set to {self.boat_state['rudder_angle']}°"
+            self.state.rudder_angle = max(-45, min(45, angle))
+            return True, f"Rudder set to {self.state.rudder_angle}°"
             
         elif action == 'set_throttle':
             speed = payload.get('speed', 0)
-            self.boat_state['throttle_percent'] = max(0, min(100, speed))
-            self.boat_state['motor_running'] = speed > 0
+            self.state.throttle_percent = max(0, min(100, speed))
+            self.state.motor_running = speed > 0
             
-            return True, f"Throttle set to {self.boat_state['throttle_percent']}%"
+            return True, f"Throttle set to {self.state.throttle_percent}%"
             
         elif action == 'stop_motors':
-            self.boat_state['throttle_percent'] = 0
-            self.boat_state['motor_running'] = False
-            self.boat_state['navigation_mode'] = 'idle'
+            self.state.throttle_percent = 0
+            self.state.motor_running = False
+            self.state.navigation_mode = 'idle'
             
             return True, "Motors stopped"
         
@@ -535,6 +680,10 @@ class BoatSimulator:
         
         return False, f"Unknown status action: {action}"
     
+    def _handle_config(self, payload: Dict[str, Any]):
+        """Handle configuration update (not applied by the simulator)"""
+        self.logger.info("Configuration update received (simulated)")
+    
     def _handle_emergency_command(self, payload: Dict[str, Any]) -> tuple:
         """Handle emergency commands"""
         action = payload.get('action')
@@ -542,11 +691,11 @@ class BoatSimulator:
         if action == 'emergency_stop':
             reason = payload.get('reason', 'Remote emergency command')
             
-            self.boat_state['emergency_stop'] = True
-            self.boat_state['throttle_percent'] = 0
-            self.boat_state['rudder_angle'] = 0
-            self.boat_state['motor_running'] = False
-            self.boat_state['navigation_mode'] = 'emergency_stop'
+            self.state.emergency_stop = True
+            self.state.throttle_percent = 0
+            self.state.rudder_angle = 0
+            self.state.motor_running = False
+            self.state.navigation_mode = 'emergency_stop'
             
             self._publish_log("CRITICAL", f"Emergency stop activated: {reason}")
             
@@ -558,6 +707,7 @@ class BoatSimulator:
         """MQTT connection callback"""
         if rc == 0:
             self.connected = True
+            self._connected_event.set()
             self.logger.info("Simulator connected to MQTT broker")
             
             # Subscribe to command topics
@@ -575,22 +725,21 @@ class BoatSimulator:
     def _on_disconnect(self, client, userdata, rc):
         """MQTT disconnection callback"""
         self.connected = False
+        self._connected_event.clear()
         if rc != 0:
             self.logger.warning(f"Simulator disconnected unexpectedly: {rc}")
     
     def _on_message(self, client, userdata, msg):
         """MQTT message received callback"""
         try:
-            topic = msg.topic
-            payload = json.loads(msg.payload.decode('utf-8'))
-            
-            # Route messages
-            if topic == self.topics['commands']:
-                self._handle_command(payload)
-            elif topic == self.topics['config']:
-                self.logger.info("Configuration update received (simulated)")
-            elif topic == self.topics['emergency']:
-                self._handle_command(payload)
+            # Route messages; payloads on unhandled topics are not even parsed
+            handler = self._topic_handlers.get(msg.topic)
+            if handler:
+                payload = _json_loads(msg.payload)
+                # Settle the physics up to now so the command takes effect from this moment
+                with self._state_lock:
+                    self._sync_physics()
+                    handler(payload)
             
         except json.JSONDecodeError as e:
             self.logger.error(f"Failed to decode message: {e}")
@@ -606,6 +755,10 @@ class BoatSimulator:
         return logging.getLogger(__name__)
 
 
+# Set to end the main thread's wait in main()
+stop_event = threading.Event()
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='PiBoat2 Simulator')
@@ -615,27 +768,31 @@ def main():
                        help='Override boat ID')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Enable verbose logging')
+    parser.add_argument('--mqtt-log-level', default='INFO',
+                       choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
+                       help='Minimum level of log messages published over MQTT')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    simulator = BoatSimulator(config_file=args.config, boat_id=args.boat_id)
+    simulator = BoatSimulator(config_file=args.config, boat_id=args.boat_id,
+                              mqtt_log_level=getattr(logging, args.mqtt_log_level))
     
     try:
         if simulator.start_simulation():
             print(f"🚤 PiBoat2 Simulator started for boat: {simulator.config.boat_id}")
             print("Press Ctrl+C to stop")
             
-            # Keep running
-            while True:
-                time.sleep(1)
+            # Keep running until interrupted
+            stop_event.wait()
         else:
             print("Failed to start simulator")
             sys.exit(1)
             
     except KeyboardInterrupt:
+        stop_event.set()
         print("\nStopping simulator...")
         simulator.stop_simulation()
         sys.exit(0)
@@ -95,10 +95,16 @@ def quick_compass_test():
         time.sleep(0.5)
     
     if headings:
-        avg_heading = sum(headings) / len(headings)
-        # Calculate standard deviation
-        variance = sum((h - avg_heading)**2 for h in headings) / len(headings)
-        std_dev = math.sqrt(variance)
+        # Circular statistics so readings either side of north (e.g. 359° and 1°)
+        # average to 0° rather than 180°
+        radians = [math.radians(h) for h in headings]
+        mean_sin = sum(math.sin(r) for r in radians) / len(radians)
+        mean_cos = sum(math.cos(r) for r in radians) / len(radians)
+        avg_heading = math.degrees(math.atan2(mean_sin, mean_cos)) % 360
+        
+        # Circular standard deviation from the mean resultant length
+        resultant = min(1.0, math.hypot(mean_sin, mean_cos))
+        std_dev = math.degrees(math.sqrt(-2 * math.log(max(resultant, 1e-12))))
         
         print(f"\nResults:")
         print(f"Average heading: {avg_heading:.1f}°")
@@ -9,7 +9,10 @@ import sys
 import time
 import logging
 import argparse
+import threading
+import multiprocessing
 from datetime import datetime
+from operator import itemgetter
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -21,22 +24,91 @@ from boat.navigation.safety_monitor import SafetyMonitor
 from boat.config.mqtt_config import ConfigManager
 
 
+# Fields shown on the GPS test's progress line, fetched from get_gps_data() in one call
+_GPS_PROGRESS_FIELDS = itemgetter('latitude', 'longitude', 'satellites', 'fix_quality')
+
+
+class _FakeMotor:
+    """Fixed-response motor controller double for the simulated navigation/safety tests"""
+    __slots__ = ()
+    
+    def get_current_heading(self):
+        return 180.0  # Facing south
+    
+    def get_status(self):
+        return {
+            'throttle_percent': 0,
+            'rudder_angle': 0,
+            'motor_running': False,
+            'battery_voltage': 12.5,
+            'temperature': 25.0
+        }
+    
+    def set_throttle(self, speed):
+        pass
+    
+    def set_rudder_angle(self, angle):
+        pass
+    
+    def stop_all_motors(self):
+        pass
+    
+    def emergency_stop(self):
+        return True
+
+
+class _FakeGPS:
+    """Fixed-position GPS handler double for the simulated navigation/safety tests"""
+    __slots__ = ()
+    
+    def get_position(self):
+        return {
+            'latitude': 40.7128,
+            'longitude': -74.0060,
+            'accuracy': 3.0,
+            'satellites': 8,
+            'fix_quality': 1
+        }
+
+
 class BoatComponentTester:
     """Test boat components independently"""
     
-    def __init__(self, config_file=None):
+    def __init__(self, config_file=None, low_latency=False, config=None):
         self.logger = self._setup_logging()
+        self.config_file = config_file
+        self.low_latency = low_latency
         
-        # Try to load config, use defaults if failed
-        try:
-            self.config_manager = ConfigManager(config_file)
-            self.config = self.config_manager.load_config()
-        except Exception as e:
-            self.logger.warning(f"Config load failed, using defaults: {e}")
-            self.config = None
+        # Soak and dwell lengths; CI can shorten them through the environment (see --help)
+        self.gps_duration = float(os.getenv('PIBOAT_GPS_DURATION', 30))
+        self.motor_dwell = float(os.getenv('PIBOAT_MOTOR_DWELL', 2))
+        
+        # Set when run_all_tests is interrupted; test waits end early so each test still
+        # reaches its own cleanup
+        self._stop_event = threading.Event()
+        
+        # Reuse an already-loaded config when given one (the GPS child process), otherwise
+        # try to load it, using defaults if that fails
+        self.config_manager = None
+        self.config = config
+        if self.config is None:
+            try:
+                self.config_manager = ConfigManager(config_file)
+                self.config = self.config_manager.load_config()
+            except Exception as e:
+                self.logger.warning(f"Config load failed, using defaults: {e}")
+                self.config = None
         
-        # Components
-        self.motor_controller = None
+        # Device settings from config, or defaults
+        hardware = self.config.hardware if self.config else {}
+        self.gps_device = hardware.get('gps_device', '/dev/ttyUSB0')
+        self.gps_baudrate = hardware.get('gps_baudrate', 9600)
+        self.motor_device = hardware.get('motor_controller_device', '/dev/ttyUSB1')
+        
+        # Components. The motor controller is constructed up front (its duty-cycle lookup
+        # tables are built here) so that one-time setup is not part of the motor test;
+        # hardware is only touched when the test calls initialize()
+        self.motor_controller = MotorController()
         self.gps_handler = None
         self.navigation_controller = None
         self.safety_monitor = None
@@ -46,56 +118,80 @@ class BoatComponentTester:
         self.logger.info("🛰️  Testing GPS Component")
         self.logger.info("-" * 40)
         
+        # Wake on each fix the reader thread parses rather than on a fixed 1 s tick
+        fix_event = threading.Event()
+        
+        def on_fix(position):
+            fix_event.set()
+        
         try:
-            # Get GPS device from config or use default
-            if self.config:
-                gps_device = self.config.hardware.get('gps_device', '/dev/ttyUSB0')
-                gps_baudrate = self.config.hardware.get('gps_baudrate', 9600)
-            else:
-                gps_device = '/dev/ttyUSB0'
-                gps_baudrate = 9600
-            
-            self.logger.info(f"Initializing GPS: {gps_device} @ {gps_baudrate}")
+            self.logger.info(f"Initializing GPS: {self.gps_device} @ {self.gps_baudrate}")
             
-            self.gps_handler = GPSHandler(port=gps_device, baudrate=gps_baudrate)
+            self.gps_handler = GPSHandler(port=self.gps_device, baudrate=self.gps_baudrate,
+                                          low_latency=self.low_latency)
             
             self.gps_handler.start()
             # Wait a moment for GPS to start
             time.sleep(1)
             
             self.logger.info("✅ GPS initialized successfully")
+            self.gps_handler.subscribe(on_fix)
             
             # Test GPS data reading
-            self.logger.info("Reading GPS data for 30 seconds...")
-            start_time = time.time()
+            self.logger.info(f"Reading GPS data for {self.gps_duration:g} seconds...")
+            deadline = time.monotonic() + self.gps_duration
             readings = 0
+            # On a terminal, repaint the progress line only when the fix changes; when stdout
+            # is a pipe or file, log a progress line every 5 s instead of \r updates
+            interactive = sys.stdout.isatty()
+            last_shown = None
+            next_progress_log = time.monotonic()
             
-            while (time.time() - start_time) < 30:
+            while (remaining := deadline - time.monotonic()) > 0:
                 try:
-                    gps_data = self.gps_handler.get_gps_data()
+                    # Fall back to a 1 s status refresh while no fixes are arriving
+                    if fix_event.wait(min(remaining, 1.0)):
+                        fix_event.clear()
+                        gps_data = self.gps_handler.get_gps_data()
+                    else:
+                        gps_data = None
                     
                     if gps_data:
                         readings += 1
-                        lat = gps_data.get('latitude', 'N/A')
-                        lon = gps_data.get('longitude', 'N/A')
-                        sats = gps_data.get('satellites', 'N/A')
-                        fix = gps_data.get('fix_quality', 'N/A')
-                        
-                        print(f"\r📍 Lat: {lat}, Lon: {lon}, Sats: {sats}, Fix: {fix} ({readings} readings)", end='')
+                        try:
+                            shown = _GPS_PROGRESS_FIELDS(gps_data)
+                        except KeyError:
+                            shown = ('N/A', 'N/A', 'N/A', 'N/A')
                     else:
-                        print("\r📍 No GPS data available", end='')
+                        shown = None
                     
-                    time.sleep(1)
+                    if interactive:
+                        if shown != last_shown:
+                            last_shown = shown
+                            if shown:
+                                lat, lon, sats, fix = shown
+                                sys.stdout.write(f"\r📍 Lat: {lat}, Lon: {lon}, Sats: {sats}, Fix: {fix} ({readings} readings)")
+                            else:
+                                sys.stdout.write("\r📍 No GPS data available")
+                            sys.stdout.flush()
+                    elif (now := time.monotonic()) >= next_progress_log:
+                        next_progress_log = now + 5
+                        if shown:
+                            lat, lon, sats, fix = shown
+                            self.logger.info(f"📍 Lat: {lat}, Lon: {lon}, Sats: {sats}, Fix: {fix} ({readings} readings)")
+                        else:
+                            self.logger.info("📍 No GPS data available")
                     
                 except KeyboardInterrupt:
                     break
                 except Exception as e:
                     self.logger.error(f"GPS read error: {e}")
             
-            print()  # New line
+            if interactive:
+                print()  # New line
             
             if readings > 0:
-                self.logger.info(f"✅ GPS test completed - {readings} readings in 30s")
+                self.logger.info(f"✅ GPS test completed - {readings} readings in {self.gps_duration:g}s")
                 return True
             else:
                 self.logger.warning("⚠️  No GPS readings obtained")
@@ -106,23 +202,39 @@ class BoatComponentTester:
             return False
         finally:
             if self.gps_handler:
+                self.gps_handler.unsubscribe(on_fix)
                 self.gps_handler.stop()
     
+    def test_gps_component_isolated(self) -> bool:
+        """
+        Run the GPS test in a child process, so the handler's serial reader thread has its
+        own GIL instead of contending with the motor and navigation threads running alongside
+        """
+        # Spawn, not fork: this starts from a worker thread while other tests may hold locks
+        # (logging, serial) that a forked child would inherit permanently locked
+        context = multiprocessing.get_context('spawn')
+        process = context.Process(target=_run_gps_test_process,
+                                  args=(self.config_file, self.low_latency, self.config,
+                                        logging.getLogger().level),
+                                  name="gps-test")
+        process.start()
+        while process.exitcode is None:
+            process.join(0.5)
+            if self._stop_event.is_set() and process.is_alive():
+                # The child got the same Ctrl-C; give it a moment to stop the GPS cleanly
+                process.join(2)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        return process.exitcode == 0
+    
     def test_motor_component(self) -> bool:
         """Test motor controller standalone"""
         self.logger.info("🚤 Testing Motor Controller Component")
         self.logger.info("-" * 40)
         
         try:
-            # Get motor device from config or use default
-            if self.config:
-                motor_device = self.config.hardware.get('motor_controller_device', '/dev/ttyUSB1')
-            else:
-                motor_device = '/dev/ttyUSB1'
-            
-            self.logger.info(f"Initializing Motor Controller: {motor_device}")
-            
-            self.motor_controller = MotorController()
+            self.logger.info(f"Initializing Motor Controller: {self.motor_device}")
             
             if not self.motor_controller.initialize():
                 self.logger.error("❌ Motor controller initialization failed")
@@ -135,9 +247,8 @@ class BoatComponentTester:
             status = self.motor_controller.get_motor_status()
             
             if status:
-                self.logger.info("📊 Motor Status:")
-                for key, value in status.items():
-                    self.logger.info(f"   {key}: {value}")
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("📊 Motor Status:\n" + self._format_status(status))
             else:
                 self.logger.warning("⚠️  No motor status available")
             
@@ -147,30 +258,39 @@ class BoatComponentTester:
             # Small rudder test
             self.logger.info("Testing rudder: -10° → 0° → +10° → 0°")
             
+            # (description, angle, hold seconds); holds run on an absolute monotonic schedule
+            # so logging and PWM write time do not stretch the sequence
             movements = [
-                ("Rudder -10°", lambda: self.motor_controller.set_rudder(-10)),
-                ("Wait 2s", lambda: time.sleep(2)),
-                ("Rudder 0°", lambda: self.motor_controller.set_rudder(0)),
-                ("Wait 2s", lambda: time.sleep(2)),
-                ("Rudder +10°", lambda: self.motor_controller.set_rudder(10)),
-                ("Wait 2s", lambda: time.sleep(2)),
-                ("Rudder 0°", lambda: self.motor_controller.set_rudder(0)),
+                ("Rudder -10°", -10, self.motor_dwell),
+                ("Rudder 0°", 0, self.motor_dwell),
+                ("Rudder +10°", 10, self.motor_dwell),
+                ("Rudder 0°", 0, 0),
             ]
             
-            for description, action in movements:
+            step_deadline = time.monotonic()
+            for description, angle, hold in movements:
                 try:
                     self.logger.info(f"  {description}")
-                    action()
+                    self.motor_controller.set_rudder(angle)
                 except Exception as e:
                     self.logger.error(f"❌ Motor test failed at '{description}': {e}")
                     return False
+                
+                if hold:
+                    step_deadline += hold
+                    if self._stop_event.wait(max(0.0, step_deadline - time.monotonic())):
+                        self.logger.warning("⚠️  Motor test interrupted")
+                        return False
             
             # Test throttle (very low)
             self.logger.info("Testing throttle: 5% → 0%")
             try:
                 self.motor_controller.set_throttle(5)  # Very low throttle
-                time.sleep(2)
+                interrupted = self._stop_event.wait(self.motor_dwell)
                 self.motor_controller.set_throttle(0)
+                if interrupted:
+                    self.logger.warning("⚠️  Motor test interrupted")
+                    return False
                 self.logger.info("✅ Throttle test completed")
             except Exception as e:
                 self.logger.error(f"❌ Throttle test failed: {e}")
@@ -201,23 +321,8 @@ class BoatComponentTester:
         
         try:
             # Create mock components for navigation testing
-            from unittest.mock import Mock
-            
-            mock_motor = Mock()
-            mock_motor.get_current_heading.return_value = 180.0  # Facing south
-            mock_motor.set_throttle = Mock()
-            mock_motor.set_rudder_angle = Mock()
-            mock_motor.stop_all_motors = Mock()
-            mock_motor.emergency_stop = Mock(return_value=True)
-            
-            mock_gps = Mock()
-            mock_gps.get_position.return_value = {
-                'latitude': 40.7128,
-                'longitude': -74.0060,
-                'accuracy': 3.0,
-                'satellites': 8,
-                'fix_quality': 1
-            }
+            mock_motor = _FakeMotor()
+            mock_gps = _FakeGPS()
             
             self.logger.info("✅ Mock components created")
             
@@ -237,18 +342,12 @@ class BoatComponentTester:
                 self.logger.info("✅ Waypoint navigation started")
                 
                 # Let it run for a few seconds
-                time.sleep(3)
+                self._stop_event.wait(3)
                 
                 # Get status
                 status = self.navigation_controller.get_status()
-                self.logger.info("📊 Navigation Status:")
-                for key, value in status.items():
-                    if isinstance(value, dict):
-                        self.logger.info(f"   {key}:")
-                        for subkey, subvalue in value.items():
-                            self.logger.info(f"     {subkey}: {subvalue}")
-                    else:
-                        self.logger.info(f"   {key}: {value}")
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("📊 Navigation Status:\n" + self._format_status(status))
                 
                 # Stop navigation
                 self.navigation_controller.stop_current_navigation()
@@ -263,7 +362,7 @@ class BoatComponentTester:
             
             if result:
                 self.logger.info("✅ Course set successfully")
-                time.sleep(2)
+                self._stop_event.wait(2)
                 self.navigation_controller.stop_current_navigation()
             else:
                 self.logger.error("❌ Failed to set course")
@@ -275,7 +374,7 @@ class BoatComponentTester:
             
             if result:
                 self.logger.info("✅ Position hold engaged")
-                time.sleep(2)
+                self._stop_event.wait(2)
                 self.navigation_controller.stop_current_navigation()
             else:
                 self.logger.error("❌ Failed to engage position hold")
@@ -294,27 +393,9 @@ class BoatComponentTester:
         self.logger.info("-" * 40)
         
         try:
-            from unittest.mock import Mock
-            
             # Create mock components
-            mock_gps = Mock()
-            mock_gps.get_position.return_value = {
-                'latitude': 40.7128,
-                'longitude': -74.0060,
-                'accuracy': 3.0,
-                'satellites': 8,
-                'fix_quality': 1
-            }
-            
-            mock_motor = Mock()
-            mock_motor.get_status.return_value = {
-                'throttle_percent': 0,
-                'rudder_angle': 0,
-                'motor_running': False,
-                'battery_voltage': 12.5,
-                'temperature': 25.0
-            }
-            mock_motor.emergency_stop = Mock(return_value=True)
+            mock_gps = _FakeGPS()
+            mock_motor = _FakeMotor()
             
             self.logger.info("✅ Mock components created")
             
@@ -331,17 +412,21 @@ class BoatComponentTester:
             self.logger.info("Testing immediate safety check...")
             safety_status = self.safety_monitor.check_immediate_safety()
             
-            self.logger.info("📊 Safety Status:")
-            self.logger.info(f"   Safe: {safety_status['safe']}")
-            self.logger.info(f"   Violations: {len(safety_status['violations'])}")
-            self.logger.info(f"   Warnings: {len(safety_status['warnings'])}")
+            # Status summary and warnings are INFO-level; skip building them when that is off
+            if self.logger.isEnabledFor(logging.INFO):
+                lines = [
+                    "📊 Safety Status:",
+                    f"   Safe: {safety_status['safe']}",
+                    f"   Violations: {len(safety_status['violations'])}",
+                    f"   Warnings: {len(safety_status['warnings'])}",
+                ]
+                lines.extend(f"   ⚠️  {warning['type']}: {warning['message']}"
+                             for warning in safety_status['warnings'])
+                self.logger.info("\n".join(lines))
             
             for violation in safety_status['violations']:
                 self.logger.warning(f"   ❌ {violation['type']}: {violation['message']}")
             
-            for warning in safety_status['warnings']:
-                self.logger.info(f"   ⚠️  {warning['type']}: {warning['message']}")
-            
             # Test safety limits update
             self.logger.info("Testing safety limits update...")
             self.safety_monitor.set_safety_limits({
@@ -360,14 +445,8 @@ class BoatComponentTester:
             
             # Get safety status
             status = self.safety_monitor.get_status()
-            self.logger.info("📊 Safety Monitor Status:")
-            for key, value in status.items():
-                if isinstance(value, dict):
-                    self.logger.info(f"   {key}:")
-                    for subkey, subvalue in value.items():
-                        self.logger.info(f"     {subkey}: {subvalue}")
-                else:
-                    self.logger.info(f"   {key}: {value}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("📊 Safety Monitor Status:\n" + self._format_status(status))
             
             self.logger.info("✅ Safety monitor test completed")
             return True
@@ -382,7 +461,12 @@ class BoatComponentTester:
         self.logger.info("-" * 40)
         
         try:
-            if not self.config:
+            if not self.config and self.config_file is None:
+                # __init__ already tried the default sources; a second load would re-read
+                # the same files and environment and fail the same way
+                self.logger.error("❌ Failed to load default configuration")
+                return False
+            elif not self.config:
                 self.logger.warning("⚠️  No configuration loaded, testing defaults...")
                 
                 # Test with default config
@@ -414,7 +498,7 @@ class BoatComponentTester:
         
         tests = [
             ("Configuration", self.test_configuration),
-            ("GPS Component", self.test_gps_component),
+            ("GPS Component", self.test_gps_component_isolated),
             ("Motor Component", self.test_motor_component),
             ("Navigation Component", self.test_navigation_component),
             ("Safety Component", self.test_safety_component),
@@ -422,33 +506,71 @@ class BoatComponentTester:
         
         passed = 0
         total = len(tests)
+        results = {}
         
-        for test_name, test_func in tests:
+        def run_test(test_name, test_func):
             self.logger.info(f"\n{'='*20} {test_name} {'='*20}")
-            
             try:
-                if test_func():
-                    passed += 1
-                    self.logger.info(f"✅ {test_name} PASSED")
-                else:
-                    self.logger.error(f"❌ {test_name} FAILED")
+                results[test_name] = test_func()
             except Exception as e:
-                self.logger.error(f"❌ {test_name} FAILED with exception: {e}")
-            
-            self.logger.info(f"{'='*50}")
+                results[test_name] = e
+        
+        # Each test drives its own device (or mocks), so they run side by side and the
+        # 30 s GPS soak overlaps the motor, navigation and safety tests; output interleaves.
+        # Not daemons: an interrupted run still waits for each test's cleanup (motor stop).
+        self._stop_event.clear()
+        threads = [
+            threading.Thread(target=run_test, args=(test_name, test_func), name=test_name)
+            for test_name, test_func in tests
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        except KeyboardInterrupt:
+            self.logger.warning("Interrupted - stopping tests and waiting for cleanup...")
+            self._stop_event.set()
+            for thread in threads:
+                thread.join()
+            raise
+        
+        self.logger.info(f"\n{'='*50}")
+        for test_name, _ in tests:
+            result = results.get(test_name)
+            if isinstance(result, Exception):
+                self.logger.error(f"❌ {test_name} FAILED with exception: {result}")
+            elif result:
+                passed += 1
+                self.logger.info(f"✅ {test_name} PASSED")
+            else:
+                self.logger.error(f"❌ {test_name} FAILED")
+        self.logger.info(f"{'='*50}")
         
-        # Summary
-        self.logger.info(f"\n🏁 TEST SUMMARY")
-        self.logger.info(f"Tests Passed: {passed}/{total}")
-        self.logger.info(f"Success Rate: {(passed/total)*100:.1f}%")
+        # Summary, as one record (WARNING level when anything failed)
+        summary = (f"\n🏁 TEST SUMMARY\n"
+                   f"Tests Passed: {passed}/{total}\n"
+                   f"Success Rate: {(passed/total)*100:.1f}%\n")
         
         if passed == total:
-            self.logger.info("🎉 ALL TESTS PASSED!")
+            self.logger.info(summary + "🎉 ALL TESTS PASSED!")
         else:
-            self.logger.warning(f"⚠️  {total-passed} test(s) failed")
+            self.logger.warning(summary + f"⚠️  {total-passed} test(s) failed")
         
         return passed == total
     
+    def _format_status(self, status: dict, indent: int = 3) -> str:
+        """Render a (nested) status dict as indented 'key: value' lines for a single log record"""
+        lines = []
+        for key, value in status.items():
+            if isinstance(value, dict):
+                lines.append(f"{' ' * indent}{key}:")
+                if value:
+                    lines.append(self._format_status(value, indent + 2))
+            else:
+                lines.append(f"{' ' * indent}{key}: {value}")
+        return "\n".join(lines)
+    
     def _setup_logging(self):
         """Setup logging"""
         logging.basicConfig(
@@ -458,36 +580,49 @@ class BoatComponentTester:
         return logging.getLogger(__name__)
 
 
+# --test choices and the tester method each one runs
+TEST_CHOICES = {
+    'gps': BoatComponentTester.test_gps_component,
+    'motor': BoatComponentTester.test_motor_component,
+    'nav': BoatComponentTester.test_navigation_component,
+    'safety': BoatComponentTester.test_safety_component,
+    'config': BoatComponentTester.test_configuration,
+    'all': BoatComponentTester.run_all_tests,
+}
+
+
+def _run_gps_test_process(config_file, low_latency, config, log_level):
+    """Child process entry point for BoatComponentTester.test_gps_component_isolated"""
+    tester = BoatComponentTester(config_file=config_file, low_latency=low_latency, config=config)
+    # A spawned child starts with fresh logging; keep the parent's --verbose level
+    logging.getLogger().setLevel(log_level)
+    sys.exit(0 if tester.test_gps_component() else 1)
+
+
 def main():
     """Main entry point"""
-    parser = argparse.ArgumentParser(description='PiBoat2 Component Tester')
+    parser = argparse.ArgumentParser(
+        description='PiBoat2 Component Tester',
+        epilog='Environment: PIBOAT_GPS_DURATION sets the GPS soak length in seconds (default 30); '
+               'PIBOAT_MOTOR_DWELL sets the rudder/throttle hold time in seconds (default 2).')
     parser.add_argument('-c', '--config', type=str,
                        help='Configuration file path')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='Enable verbose logging')
-    parser.add_argument('-t', '--test', choices=['gps', 'motor', 'nav', 'safety', 'config', 'all'],
+    parser.add_argument('-t', '--test', choices=list(TEST_CHOICES),
                        default='all', help='Specific test to run')
+    parser.add_argument('--low-latency', action='store_true',
+                       help='Enable low-latency mode on the GPS serial port (USB-serial adapters)')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
-    tester = BoatComponentTester(config_file=args.config)
+    tester = BoatComponentTester(config_file=args.config, low_latency=args.low_latency)
     
     try:
-        if args.test == 'all':
-            success = tester.run_all_tests()
-        elif args.test == 'gps':
-            success = tester.test_gps_component()
-        elif args.test == 'motor':
-            success = tester.test_motor_component()
-        elif args.test == 'nav':
-            success = tester.test_navigation_component()
-        elif args.test == 'safety':
-            success = tester.test_safety_component()
-        elif args.test == 'config':
-            success = tester.test_configuration()
+        success = TEST_CHOICES[args.test](tester)
         
         sys.exit(0 if success else 1)
         
@@ -10,9 +10,67 @@ import time
 import sys
 import re
 import json
+import threading
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Patterns for parsing `ping` and HTTP output, compiled once at import
+_RE_PING_LOSS = re.compile(r'(\d+)% packet loss')
+_RE_PING_TIME = re.compile(r'time=(\d+\.?\d*)ms')
+_RE_PING_RTT = re.compile(r'rtt min/avg/max/mdev = ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+) ms')
+_RE_LOCATION = re.compile(r'Location:\s*([^\r\n]+)')
+
+_JSON_ENCODER = json.JSONEncoder()
+
+# Initial receive buffer; large enough that a small HTTP response fits without growing
+_RECV_BUFFER_SIZE = 65536
+
+
+def _read_until_close(sock) -> bytes:
+    """Read from a socket until the peer closes the connection"""
+    buf = bytearray(_RECV_BUFFER_SIZE)
+    view = memoryview(buf)
+    size = 0
+    while True:
+        if size == len(buf):
+            # Full: double the buffer and re-take the view over the new storage
+            view.release()
+            buf.extend(bytes(len(buf)))
+            view = memoryview(buf)
+        received = sock.recv_into(view[size:])
+        if not received:
+            break
+        size += received
+    view.release()
+    del buf[size:]
+    return bytes(buf)
+
+
+def _json_bytes(obj) -> bytes:
+    """Serialize obj to compact UTF-8 JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return _JSON_ENCODER.encode(obj).encode('utf-8')
+
+
+def _json_loads(data: bytes):
+    """Parse UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _split_http_response(response: bytes) -> Tuple[bytes, bytes]:
+    """Split a raw HTTP/1.x response into its status line and body"""
+    status_line = response.partition(b'\r\n')[0]
+    body = response.partition(b'\r\n\r\n')[2]
+    return status_line, body
+
 class LTEConnectivityTester:
     def __init__(self, verbose=False):
         self.interface = "wwan0"
@@ -27,58 +85,123 @@ class LTEConnectivityTester:
             "Google IPv6": "2001:4860:4860::8888",
             "Cloudflare IPv6": "2606:4700:4700::1111"
         }
+        # Parsed `ip -j addr show` for the interface, shared by every test in a pass
+        self._iface_cache = None
+        # Hostname -> getaddrinfo() entries for all families, so a pass resolves each host
+        # once over the LTE link instead of once per probe
+        self._dns_cache = {}
+        # (whole second, formatted ISO prefix) for the last timestamp logged; one tuple so
+        # the concurrent ping threads always read a matching pair
+        self._ts_cache = (None, "")
+        # Per-thread list that collects results from the concurrent ping probes, so they
+        # are recorded and printed in host order once every probe has finished
+        self._deferred = threading.local()
+    
+    def _timestamp(self) -> str:
+        """Local ISO-8601 timestamp, re-formatting the date/time part once per second"""
+        now = time.time()
+        sec = int(now)
+        cached_sec, prefix = self._ts_cache
+        if sec != cached_sec:
+            prefix = datetime.fromtimestamp(sec).strftime("%Y-%m-%dT%H:%M:%S")
+            self._ts_cache = (sec, prefix)
+        return f"{prefix}.{int((now - sec) * 1e6):06d}"
     
     def _log_test_result(self, test_name: str, success: bool, message: str, raw_data: Dict = None):
         """Log detailed test results for analysis"""
         result = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self._timestamp(),
             "test_name": test_name,
             "success": success,
             "message": message,
             "raw_data": raw_data or {}
         }
+        pending = getattr(self._deferred, "results", None)
+        if pending is not None:
+            pending.append(result)
+        else:
+            self._record_test_result(result)
+    
+    def _record_test_result(self, result: Dict):
+        """Store a test result and print its raw data in verbose mode"""
         self.test_results.append(result)
         
         if self.verbose:
-            print(f"\n📝 RAW TEST DATA for {test_name}:")
-            print(f"   Success: {success}")
-            print(f"   Message: {message}")
-            if raw_data:
-                for key, value in raw_data.items():
+            print(f"\n📝 RAW TEST DATA for {result['test_name']}:")
+            print(f"   Success: {result['success']}")
+            print(f"   Message: {result['message']}")
+            if result["raw_data"]:
+                for key, value in result["raw_data"].items():
                     print(f"   {key}: {value}")
             print("-" * 40)
         
+    def _iface_info(self, refresh: bool = False) -> Optional[Dict[str, any]]:
+        """
+        Get the interface's state and addresses from one `ip -j addr show` call, cached so
+        the tests in a pass don't each fork `ip`. Returns None if the interface is missing.
+        """
+        if self._iface_cache is None or refresh:
+            result = subprocess.run(['ip', '-j', 'addr', 'show', self.interface],
+                                  capture_output=True, text=True, timeout=10)
+            if result.returncode != 0:
+                self._iface_cache = None
+                return None
+            
+            link = json.loads(result.stdout)[0]
+            flags = link.get('flags', [])
+            addr_info = link.get('addr_info', [])
+            ipv6_info = [a for a in addr_info if a.get('family') == 'inet6']
+            
+            self._iface_cache = {
+                "is_up": "UP" in flags and "LOWER_UP" in flags,
+                "ipv4": [a['local'] for a in addr_info if a.get('family') == 'inet'],
+                "ipv4_cidr": [f"{a['local']}/{a['prefixlen']}" for a in addr_info if a.get('family') == 'inet'],
+                "ipv6": [a['local'] for a in ipv6_info],
+                "ipv6_cidr": [f"{a['local']}/{a['prefixlen']}" for a in ipv6_info],
+                "ipv6_global": [a['local'] for a in ipv6_info if a.get('scope') == 'global'],
+                "raw_output": result.stdout
+            }
+        return self._iface_cache
+    
+    def _resolve(self, host: str, family: int = socket.AF_UNSPEC, refresh: bool = False) -> List[tuple]:
+        """
+        Look up host with getaddrinfo(), cached per host for the rest of the pass, and return
+        the entries for the given address family. Raises socket.gaierror if resolution fails.
+        """
+        entries = self._dns_cache.get(host)
+        if entries is None or refresh:
+            entries = socket.getaddrinfo(host, None, socket.AF_UNSPEC)
+            self._dns_cache[host] = entries
+        if family == socket.AF_UNSPEC:
+            return entries
+        return [entry for entry in entries if entry[0] == family]
+    
     def check_interface_status(self) -> Dict[str, any]:
         """Check if wwan0 interface exists and get its status"""
         print(f"🔍 Checking {self.interface} interface status...")
         
         try:
-            # Get interface information
-            result = subprocess.run(['ip', 'addr', 'show', self.interface], 
-                                  capture_output=True, text=True, timeout=10)
+            # Get interface information (refreshing the per-pass cache)
+            info = self._iface_info(refresh=True)
             
-            if result.returncode != 0:
+            if info is None:
                 return {
                     "exists": False,
                     "error": f"Interface {self.interface} not found"
                 }
             
-            output = result.stdout
-            
-            # Parse interface status
-            is_up = "UP" in output and "LOWER_UP" in output
-            
-            # Extract IP addresses
-            ipv4_addresses = re.findall(r'inet (\d+\.\d+\.\d+\.\d+/\d+)', output)
-            ipv6_addresses = re.findall(r'inet6 ([0-9a-f:]+/\d+)', output)
+            is_up = info["is_up"]
+            ipv4_addresses = info["ipv4_cidr"]
+            ipv6_addresses = info["ipv6_cidr"]
             
             status = {
                 "exists": True,
                 "is_up": is_up,
                 "ipv4_addresses": ipv4_addresses,
-                "ipv6_addresses": ipv6_addresses,
-                "raw_output": output
+                "ipv6_addresses": ipv6_addresses
             }
+            if self.verbose:
+                status["raw_output"] = info["raw_output"]
             
             print(f"✅ Interface {self.interface} found and {'UP' if is_up else 'DOWN'}")
             print(f"   IPv4 addresses: {ipv4_addresses if ipv4_addresses else 'None'}")
@@ -132,8 +255,16 @@ class LTEConnectivityTester:
             filename = f"lte_test_results_{timestamp}.json"
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(self.test_results, f, indent=2)
+            # Still a JSON array, but written one compact record per line as each is
+            # serialized rather than pretty-printing the whole list in memory first
+            with open(filename, 'wb') as f:
+                f.write(b"[")
+                separator = b"\n"
+                for result in self.test_results:
+                    f.write(separator)
+                    f.write(_json_bytes(result))
+                    separator = b",\n"
+                f.write(b"\n]\n")
             print(f"\n💾 Detailed test results saved to: {filename}")
             return filename
         except Exception as e:
@@ -162,21 +293,23 @@ class LTEConnectivityTester:
             
             raw_data.update({
                 "return_code": result.returncode,
-                "stdout": result.stdout,
-                "stderr": result.stderr,
                 "timeout": False
             })
+            # The parsed stats below cover the normal case; keep full output for --verbose
+            if self.verbose:
+                raw_data["stdout"] = result.stdout
+                raw_data["stderr"] = result.stderr
             
             if result.returncode == 0:
                 # Extract stats from ping output
-                stats_match = re.search(r'(\d+)% packet loss', result.stdout)
+                stats_match = _RE_PING_LOSS.search(result.stdout)
                 packet_loss = stats_match.group(1) if stats_match else "unknown"
                 
-                time_match = re.search(r'time=(\d+\.?\d*)ms', result.stdout)
+                time_match = _RE_PING_TIME.search(result.stdout)
                 avg_time = time_match.group(1) if time_match else "unknown"
                 
                 # Extract more detailed stats
-                rtt_match = re.search(r'rtt min/avg/max/mdev = ([\d.]+)/([\d.]+)/([\d.]+)/([\d.]+) ms', result.stdout)
+                rtt_match = _RE_PING_RTT.search(result.stdout)
                 if rtt_match:
                     raw_data.update({
                         "rtt_min": rtt_match.group(1),
@@ -220,32 +353,26 @@ class LTEConnectivityTester:
     def _get_interface_ip(self) -> str:
         """Get the first available IP address from the LTE interface"""
         try:
-            result = subprocess.run(['ip', 'addr', 'show', self.interface], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                # Try IPv4 first
-                ipv4_match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                if ipv4_match:
-                    return ipv4_match.group(1)
-                # Fall back to IPv6
-                ipv6_match = re.search(r'inet6 ([0-9a-f:]+)', result.stdout)
-                if ipv6_match:
-                    return ipv6_match.group(1)
+            info = self._iface_info()
+            if info:
+                # Try IPv4 first, then fall back to IPv6
+                if info["ipv4"]:
+                    return info["ipv4"][0]
+                if info["ipv6"]:
+                    return info["ipv6"][0]
         except:
             pass
         return "127.0.0.1"  # Fallback
     
     def _is_valid_ip(self, addr: str) -> bool:
         """Check if string is a valid IP address"""
+        # Only IPv6 text contains ':', so one inet_pton call settles it
+        family = socket.AF_INET6 if ':' in addr else socket.AF_INET
         try:
-            socket.inet_pton(socket.AF_INET, addr)
+            socket.inet_pton(family, addr)
             return True
-        except:
-            try:
-                socket.inet_pton(socket.AF_INET6, addr)
-                return True
-            except:
-                return False
+        except (OSError, ValueError):
+            return False
     
     def _socket_dns_test(self, hostname: str) -> Tuple[bool, str]:
         """DNS test using Python socket with interface binding"""
@@ -259,55 +386,54 @@ class LTEConnectivityTester:
         
         try:
             # Create a socket and bind to LTE interface
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
-            sock.settimeout(10)
-            
-            # For IPv6, we need to get the IPv6 address
-            if ipv6_addr:
-                sock.bind((ipv6_addr, 0))
-                raw_data["socket_bound"] = True
-                
-                # Try to resolve using getaddrinfo with bound socket context
-                # Note: This still uses system resolver but through our interface
-                result = socket.getaddrinfo(hostname, None, socket.AF_UNSPEC)
-                raw_data["getaddrinfo_result"] = str(result)
-                
-                addresses = []
-                ipv4_addresses = []
-                ipv6_addresses = []
-                
-                for addr_info in result:
-                    ip = addr_info[4][0]
-                    if self._is_valid_ip(ip):
-                        addresses.append(ip)
-                        if ':' in ip:
-                            ipv6_addresses.append(ip)
-                        else:
-                            ipv4_addresses.append(ip)
-                
-                raw_data.update({
-                    "all_addresses": addresses,
-                    "ipv4_addresses": ipv4_addresses,
-                    "ipv6_addresses": ipv6_addresses,
-                    "total_addresses": len(addresses)
-                })
-                
-                sock.close()
+            with socket.socket(socket.AF_INET6, socket.SOCK_DGRAM) as sock:
+                sock.settimeout(10)
                 
-                if addresses:
-                    success_msg = f"Resolved to: {', '.join(addresses[:3])}"
-                    self._log_test_result(f"dns_{hostname}", True, success_msg, raw_data)
-                    return True, success_msg
+                # For IPv6, we need to get the IPv6 address
+                if ipv6_addr:
+                    sock.bind((ipv6_addr, 0))
+                    raw_data["socket_bound"] = True
+                    
+                    # Try to resolve using getaddrinfo with bound socket context
+                    # Note: This still uses system resolver but through our interface
+                    result = self._resolve(hostname, refresh=True)
+                    if self.verbose:
+                        raw_data["getaddrinfo_result"] = str(result)
+                    
+                    addresses = []
+                    ipv4_addresses = []
+                    ipv6_addresses = []
+                    
+                    for addr_info in result:
+                        ip = addr_info[4][0]
+                        if self._is_valid_ip(ip):
+                            addresses.append(ip)
+                            if ':' in ip:
+                                ipv6_addresses.append(ip)
+                            else:
+                                ipv4_addresses.append(ip)
+                    
+                    raw_data.update({
+                        "all_addresses": addresses,
+                        "ipv4_addresses": ipv4_addresses,
+                        "ipv6_addresses": ipv6_addresses,
+                        "total_addresses": len(addresses)
+                    })
+                    
+                    if addresses:
+                        success_msg = f"Resolved to: {', '.join(addresses[:3])}"
+                        self._log_test_result(f"dns_{hostname}", True, success_msg, raw_data)
+                        return True, success_msg
+                    else:
+                        error_msg = "No valid IP addresses returned"
+                        self._log_test_result(f"dns_{hostname}", False, error_msg, raw_data)
+                        return False, error_msg
                 else:
-                    error_msg = "No valid IP addresses returned"
+                    error_msg = "No IPv6 address found on LTE interface"
+                    raw_data["socket_bound"] = False
                     self._log_test_result(f"dns_{hostname}", False, error_msg, raw_data)
                     return False, error_msg
-            else:
-                error_msg = "No IPv6 address found on LTE interface"
-                raw_data["socket_bound"] = False
-                self._log_test_result(f"dns_{hostname}", False, error_msg, raw_data)
-                return False, error_msg
-                
+                    
         except Exception as e:
             error_msg = f"Socket DNS test failed: {e}"
             raw_data["exception"] = str(e)
@@ -317,13 +443,10 @@ class LTEConnectivityTester:
     def _get_interface_ipv6(self) -> str:
         """Get the IPv6 address from the LTE interface"""
         try:
-            result = subprocess.run(['ip', '-6', 'addr', 'show', self.interface], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                # Get global IPv6 address (not link-local)
-                ipv6_match = re.search(r'inet6 ([0-9a-f:]+)/\d+.*scope global', result.stdout)
-                if ipv6_match:
-                    return ipv6_match.group(1)
+            info = self._iface_info()
+            # Get global IPv6 address (not link-local)
+            if info and info["ipv6_global"]:
+                return info["ipv6_global"][0]
         except:
             pass
         return None
@@ -333,66 +456,53 @@ class LTEConnectivityTester:
         try:
             # Create socket based on IP version preference
             family = socket.AF_INET6 if use_ipv6 else socket.AF_INET
-            sock = socket.socket(family, socket.SOCK_STREAM)
-            sock.settimeout(10)
-            
-            try:
-                # Get interface IP and bind to it
-                if use_ipv6:
-                    # Get IPv6 address of wwan0
-                    result = subprocess.run(['ip', '-6', 'addr', 'show', self.interface], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        ipv6_match = re.search(r'inet6 ([0-9a-f:]+)/\d+.*scope global', result.stdout)
-                        if ipv6_match:
-                            local_ipv6 = ipv6_match.group(1)
-                            sock.bind((local_ipv6, 0))
+            with socket.socket(family, socket.SOCK_STREAM) as sock:
+                sock.settimeout(10)
+                
+                try:
+                    # Get interface IP and bind to it
+                    info = self._iface_info()
+                    if use_ipv6:
+                        # Get IPv6 address of wwan0
+                        if info is not None:
+                            if info["ipv6_global"]:
+                                sock.bind((info["ipv6_global"][0], 0))
+                            else:
+                                return False, "No global IPv6 address found on LTE interface"
                         else:
-                            return False, "No global IPv6 address found on LTE interface"
+                            return False, "Failed to get IPv6 address from LTE interface"
                     else:
-                        return False, "Failed to get IPv6 address from LTE interface"
-                else:
-                    # Get IPv4 address of wwan0
-                    result = subprocess.run(['ip', 'addr', 'show', self.interface], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0:
-                        ipv4_match = re.search(r'inet (\d+\.\d+\.\d+\.\d+)', result.stdout)
-                        if ipv4_match:
-                            local_ipv4 = ipv4_match.group(1)
-                            sock.bind((local_ipv4, 0))
+                        # Get IPv4 address of wwan0
+                        if info is not None:
+                            if info["ipv4"]:
+                                sock.bind((info["ipv4"][0], 0))
+                            else:
+                                return False, "No IPv4 address found on LTE interface"
                         else:
-                            return False, "No IPv4 address found on LTE interface"
+                            return False, "Failed to get IPv4 address from LTE interface"
+                    
+                    # Resolve hostname to IP if needed
+                    if not self._is_valid_ip(host):
+                        try:
+                            addr_info = self._resolve(host, family)
+                            if addr_info:
+                                target_ip = addr_info[0][4][0]
+                            else:
+                                return False, f"Could not resolve {host}"
+                        except Exception as e:
+                            return False, f"DNS resolution failed: {e}"
                     else:
-                        return False, "Failed to get IPv4 address from LTE interface"
-                
-                # Resolve hostname to IP if needed
-                if not self._is_valid_ip(host):
-                    try:
-                        addr_info = socket.getaddrinfo(host, port, family)
-                        if addr_info:
-                            target_ip = addr_info[0][4][0]
-                        else:
-                            return False, f"Could not resolve {host}"
-                    except Exception as e:
-                        return False, f"DNS resolution failed: {e}"
-                else:
-                    target_ip = host
-                
-                # Connect
-                sock.connect((target_ip, port))
-                sock.close()
-                return True, f"TCP connection successful to {host}:{port} ({target_ip})"
-                
-            except socket.timeout:
-                return False, "Connection timeout"
-            except socket.error as e:
-                return False, f"Socket error: {e}"
-            finally:
-                try:
-                    sock.close()
-                except:
-                    pass
-                
+                        target_ip = host
+                    
+                    # Connect
+                    sock.connect((target_ip, port))
+                    return True, f"TCP connection successful to {host}:{port} ({target_ip})"
+                    
+                except socket.timeout:
+                    return False, "Connection timeout"
+                except socket.error as e:
+                    return False, f"Socket error: {e}"
+                    
         except Exception as e:
             return False, f"TCP test error: {e}"
     
@@ -418,77 +528,65 @@ class LTEConnectivityTester:
         """Test HTTPS connectivity using IPv6"""
         try:
             import ssl
-            import json
             
             # Create IPv6 socket
-            sock = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
-            sock.settimeout(15)
-            
-            try:
-                # Bind to IPv6 address
-                sock.bind((ipv6_addr, 0))
-                
-                # Resolve httpbin.org to IPv6
-                addr_info = socket.getaddrinfo('httpbin.org', 443, socket.AF_INET6)
-                if not addr_info:
-                    return False, "Could not resolve httpbin.org to IPv6"
-                
-                target_ipv6 = addr_info[0][4][0]
-                
-                # Create SSL context and wrap socket
-                context = ssl.create_default_context()
-                secure_sock = context.wrap_socket(sock, server_hostname='httpbin.org')
-                
-                # Connect to httpbin.org
-                secure_sock.connect((target_ipv6, 443))
-                
-                # Send HTTP request
-                request = (
-                    "GET /ip HTTP/1.1\r\n"
-                    "Host: httpbin.org\r\n"
-                    "User-Agent: LTE-Connectivity-Test/1.0\r\n"
-                    "Connection: close\r\n"
-                    "\r\n"
-                )
-                secure_sock.send(request.encode())
-                
-                # Read response
-                response = b""
-                while True:
-                    chunk = secure_sock.recv(4096)
-                    if not chunk:
-                        break
-                    response += chunk
+            with socket.socket(socket.AF_INET6, socket.SOCK_STREAM) as sock:
+                sock.settimeout(15)
                 
-                # Parse response
-                response_text = response.decode('utf-8')
-                if "200 OK" in response_text:
-                    # Extract JSON body
-                    json_start = response_text.find('{')
-                    if json_start > 0:
-                        json_body = response_text[json_start:]
-                        try:
-                            data = json.loads(json_body)
-                            return True, f"HTTPS IPv6 OK - Your IP: {data.get('origin', 'Unknown')}"
-                        except:
-                            return True, "HTTPS IPv6 OK - Connection successful"
-                    else:
-                        return True, "HTTPS IPv6 OK - Connection successful"
-                else:
-                    return False, f"HTTP Error in response: {response_text[:200]}"
-                    
-            except socket.timeout:
-                return False, "HTTPS IPv6 connection timeout"
-            except ssl.SSLError as e:
-                return False, f"SSL Error: {e}"
-            except socket.error as e:
-                return False, f"Socket error: {e}"
-            finally:
                 try:
-                    sock.close()
-                except:
-                    pass
-                
+                    # Bind to IPv6 address
+                    sock.bind((ipv6_addr, 0))
+                    
+                    # Resolve httpbin.org to IPv6
+                    addr_info = self._resolve('httpbin.org', socket.AF_INET6)
+                    if not addr_info:
+                        return False, "Could not resolve httpbin.org to IPv6"
+                    
+                    target_ipv6 = addr_info[0][4][0]
+                    
+                    # Create SSL context and wrap socket
+                    context = ssl.create_default_context()
+                    with context.wrap_socket(sock, server_hostname='httpbin.org') as secure_sock:
+                        # Connect to httpbin.org
+                        secure_sock.connect((target_ipv6, 443))
+                        
+                        # Send HTTP request
+                        request = (
+                            "GET /ip HTTP/1.1\r\n"
+                            "Host: httpbin.org\r\n"
+                            "User-Agent: LTE-Connectivity-Test/1.0\r\n"
+                            "Connection: close\r\n"
+                            "\r\n"
+                        )
+                        secure_sock.sendall(request.encode())
+                        
+                        # Read response
+                        response = _read_until_close(secure_sock)
+                        
+                        # Parse response, splitting status line and body on the raw bytes so only
+                        # the JSON body is decoded
+                        status_line, body = _split_http_response(response)
+                        if b"200 OK" in status_line:
+                            # Extract JSON body
+                            json_start = body.find(b'{')
+                            if json_start >= 0:
+                                try:
+                                    data = _json_loads(body[json_start:])
+                                    return True, f"HTTPS IPv6 OK - Your IP: {data.get('origin', 'Unknown')}"
+                                except Exception:
+                                    return True, "HTTPS IPv6 OK - Connection successful"
+                            else:
+                                return True, "HTTPS IPv6 OK - Connection successful"
+                        else:
+                            return False, f"HTTP Error in response: {response[:200].decode('utf-8', errors='replace')}"
+                            
+                except socket.timeout:
+                    return False, "HTTPS IPv6 connection timeout"
+                except ssl.SSLError as e:
+                    return False, f"SSL Error: {e}"
+                except socket.error as e:
+                    return False, f"Socket error: {e}"
+                    
         except Exception as e:
             return False, f"HTTPS IPv6 Error: {e}"
     
@@ -496,69 +594,65 @@ class LTEConnectivityTester:
         """Test HTTPS connectivity using IPv4"""
         try:
             import ssl
-            import json
             
             # Create IPv4 socket
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(15)
-            
-            try:
-                # Bind to IPv4 address
-                sock.bind((ipv4_addr, 0))
-                
-                # Create SSL context and wrap socket
-                context = ssl.create_default_context()
-                secure_sock = context.wrap_socket(sock, server_hostname='httpbin.org')
-                
-                # Connect to httpbin.org
-                secure_sock.connect(('httpbin.org', 443))
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.settimeout(15)
                 
-                # Send HTTP request
-                request = (
-                    "GET /ip HTTP/1.1\r\n"
-                    "Host: httpbin.org\r\n"
-                    "User-Agent: LTE-Connectivity-Test/1.0\r\n"
-                    "\r\n"
-                )
-                secure_sock.send(request.encode())
-                
-                # Read response
-                response = b""
-                while True:
-                    chunk = secure_sock.recv(4096)
-                    if not chunk:
-                        break
-                    response += chunk
-                
-                # Parse response
-                response_text = response.decode('utf-8')
-                if "200 OK" in response_text:
-                    # Extract JSON body
-                    json_start = response_text.find('{')
-                    if json_start > 0:
-                        json_body = response_text[json_start:]
-                        try:
-                            data = json.loads(json_body)
-                            return True, f"HTTPS IPv4 OK - Your IP: {data.get('origin', 'Unknown')}"
-                        except:
-                            return True, "HTTPS IPv4 OK - Connection successful"
-                    else:
-                        return True, "HTTPS IPv4 OK - Connection successful"
-                else:
-                    return False, f"HTTP Error in response: {response_text[:200]}"
-                    
-            except socket.timeout:
-                return False, "HTTPS IPv4 connection timeout"
-            except ssl.SSLError as e:
-                return False, f"SSL Error: {e}"
-            except socket.error as e:
-                return False, f"Socket error: {e}"
-            finally:
                 try:
-                    sock.close()
-                except:
-                    pass
-                
+                    # Bind to IPv4 address
+                    sock.bind((ipv4_addr, 0))
+                    
+                    # Resolve httpbin.org to IPv4
+                    addr_info = self._resolve('httpbin.org', socket.AF_INET)
+                    if not addr_info:
+                        return False, "Could not resolve httpbin.org to IPv4"
+                    
+                    target_ipv4 = addr_info[0][4][0]
+                    
+                    # Create SSL context and wrap socket
+                    context = ssl.create_default_context()
+                    with context.wrap_socket(sock, server_hostname='httpbin.org') as secure_sock:
+                        # Connect to httpbin.org
+                        secure_sock.connect((target_ipv4, 443))
+                        
+                        # Send HTTP request
+                        request = (
+                            "GET /ip HTTP/1.1\r\n"
+                            "Host: httpbin.org\r\n"
+                            "User-Agent: LTE-Connectivity-Test/1.0\r\n"
+                            "Connection: close\r\n"
+                            "\r\n"
+                        )
+                        secure_sock.sendall(request.encode())
+                        
+                        # Read response
+                        response = _read_until_close(secure_sock)
+                        
+                        # Parse response, splitting status line and body on the raw bytes so only
+                        # the JSON body is decoded
+                        status_line, body = _split_http_response(response)
+                        if b"200 OK" in status_line:
+                            # Extract JSON body
+                            json_start = body.find(b'{')
+                            if json_start >= 0:
+                                try:
+                                    data = _json_loads(body[json_start:])
+                                    return True, f"HTTPS IPv4 OK - Your IP: {data.get('origin', 'Unknown')}"
+                                except Exception:
+                                    return True, "HTTPS IPv4 OK - Connection successful"
+                            else:
+                                return True, "HTTPS IPv4 OK - Connection successful"
+                        else:
+                            return False, f"HTTP Error in response: {response[:200].decode('utf-8', errors='replace')}"
+                            
+                except socket.timeout:
+                    return False, "HTTPS IPv4 connection timeout"
+                except ssl.SSLError as e:
+                    return False, f"SSL Error: {e}"
+                except socket.error as e:
+                    return False, f"Socket error: {e}"
+                    
         except Exception as e:
             return False, f"HTTPS IPv4 Error: {e}"
     
@@ -577,58 +671,51 @@ class LTEConnectivityTester:
             
             # Test HTTP (often redirected) - using raw socket with LTE binding
             try:
-                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                sock.settimeout(10)
-                sock.bind((interface_ip, 0))
-                
-                # Connect to google.com:80
-                try:
-                    addr_info = socket.getaddrinfo('google.com', 80, socket.AF_INET)
-                    if addr_info:
-                        google_ip = addr_info[0][4][0]
-                        sock.connect((google_ip, 80))
-                        
-                        # Send HTTP request
-                        request = (
-                            "GET / HTTP/1.1\r\n"
-                            "Host: google.com\r\n"
-                            "User-Agent: LTE-Connectivity-Test/1.0\r\n"
-                            "Connection: close\r\n"
-                            "\r\n"
-                        )
-                        sock.send(request.encode())
-                        
-                        # Read response
-                        response = b""
-                        while True:
-                            chunk = sock.recv(4096)
-                            if not chunk:
-                                break
-                            response += chunk
-                        
-                        response_text = response.decode('utf-8', errors='ignore')
-                        
-                        # Check for redirects
-                        if 'Location:' in response_text:
-                            location_match = re.search(r'Location:\s*([^\r\n]+)', response_text)
-                            if location_match:
-                                redirect = location_match.group(1).strip()
-                                results['http_redirect'] = redirect
-                                
-                                # Detect carrier from redirect
-                                redirect_lower = redirect.lower()
-                                if 't-mobile' in redirect_lower or 'tmobile' in redirect_lower:
-                                    results['carrier'] = 'T-Mobile'
-                                elif 'verizon' in redirect_lower:
-                                    results['carrier'] = 'Verizon'
-                                elif 'att' in redirect_lower or 'at&t' in redirect_lower:
-                                    results['carrier'] = 'AT&T'
-                        
-                        sock.close()
-                        
-                except Exception as connect_error:
-                    results['http_connect_error'] = str(connect_error)
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.settimeout(10)
+                    sock.bind((interface_ip, 0))
                     
+                    # Connect to google.com:80
+                    try:
+                        addr_info = self._resolve('google.com', socket.AF_INET)
+                        if addr_info:
+                            google_ip = addr_info[0][4][0]
+                            sock.connect((google_ip, 80))
+                            
+                            # Send HTTP request
+                            request = (
+                                "GET / HTTP/1.1\r\n"
+                                "Host: google.com\r\n"
+                                "User-Agent: LTE-Connectivity-Test/1.0\r\n"
+                                "Connection: close\r\n"
+                                "\r\n"
+                            )
+                            sock.sendall(request.encode())
+                            
+                            # Read response
+                            response = _read_until_close(sock)
+                            
+                            response_text = response.decode('utf-8', errors='ignore')
+                            
+                            # Check for redirects
+                            if 'Location:' in response_text:
+                                location_match = _RE_LOCATION.search(response_text)
+                                if location_match:
+                                    redirect = location_match.group(1).strip()
+                                    results['http_redirect'] = redirect
+                                    
+                                    # Detect carrier from redirect
+                                    redirect_lower = redirect.lower()
+                                    if 't-mobile' in redirect_lower or 'tmobile' in redirect_lower:
+                                        results['carrier'] = 'T-Mobile'
+                                    elif 'verizon' in redirect_lower:
+                                        results['carrier'] = 'Verizon'
+                                    elif 'att' in redirect_lower or 'at&t' in redirect_lower:
+                                        results['carrier'] = 'AT&T'
+                            
+                    except Exception as connect_error:
+                        results['http_connect_error'] = str(connect_error)
+                        
             except Exception as sock_error:
                 results['http_socket_error'] = str(sock_error)
             
@@ -702,25 +789,41 @@ class LTEConnectivityTester:
         success_count = 0
         total_tests = 0
         
-        # Test IPv4 connectivity if available
+        # Ping IPv4 and/or IPv6 hosts, whichever families are available. The probes run
+        # side by side since each mostly waits on ping timeouts, so the pass takes as long
+        # as the slowest host rather than the sum; results are reported in host order.
+        probes = []
         if has_ipv4:
-            for name, host in self.test_hosts.items():
-                print(f"\n📡 Testing IPv4 ping to {name} ({host})...")
-                success, message = self.test_ping_through_interface(host, use_ipv6=False)
-                print(f"   {'✅' if success else '❌'} {message}")
-                total_tests += 1
-                if success:
-                    success_count += 1
-        
-        # Test IPv6 connectivity if available
+            probes += [("IPv4", name, host, False) for name, host in self.test_hosts.items()]
         if has_ipv6:
-            for name, host in self.ipv6_test_hosts.items():
-                print(f"\n📡 Testing IPv6 ping to {name} ({host})...")
-                success, message = self.test_ping_through_interface(host, use_ipv6=True)
-                print(f"   {'✅' if success else '❌'} {message}")
-                total_tests += 1
-                if success:
-                    success_count += 1
+            probes += [("IPv6", name, host, True) for name, host in self.ipv6_test_hosts.items()]
+        
+        ping_results = [None] * len(probes)
+        probe_logs = [[] for _ in probes]
+        
+        def run_probe(index, host, use_ipv6):
+            self._deferred.results = probe_logs[index]
+            ping_results[index] = self.test_ping_through_interface(host, use_ipv6=use_ipv6)
+        
+        if probes:
+            print(f"\n📡 Pinging {len(probes)} hosts...")
+        threads = [
+            threading.Thread(target=run_probe, args=(index, host, use_ipv6), daemon=True)
+            for index, (_, _, host, use_ipv6) in enumerate(probes)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        for (family, name, host, _), (success, message), logs in zip(probes, ping_results, probe_logs):
+            print(f"\n📡 {family} ping to {name} ({host}):")
+            for result in logs:
+                self._record_test_result(result)
+            print(f"   {'✅' if success else '❌'} {message}")
+            total_tests += 1
+            if success:
+                success_count += 1
         
         # Test DNS resolution
         print(f"\n🔍 Testing DNS resolution...")
@@ -811,7 +914,7 @@ def main():
     
     parser = argparse.ArgumentParser(description="LTE USB Adapter Connectivity Tester")
     parser.add_argument("-v", "--verbose", action="store_true", 
-                       help="Show detailed raw test data")
+                       help="Show detailed raw test data and keep raw command output in saved results")
     parser.add_argument("-s", "--save", action="store_true",
                        help="Save detailed results to JSON file")
     parser.add_argument("-o", "--output", type=str,
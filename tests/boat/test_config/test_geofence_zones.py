@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for loading geofence zones from the YAML configuration file.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).parent.parent.parent.parent))
+
+yaml = pytest.importorskip("yaml")
+
+from boat.config.mqtt_config import load_geofence_zones
+
+
+def _write_zones(path, zones):
+    path.write_text(yaml.safe_dump({'zones': zones}))
+    return str(path)
+
+
+def test_bad_zone_is_skipped_without_dropping_the_others(tmp_path):
+    config_file = _write_zones(tmp_path / "geofence_zones.yaml", [
+        {'name': 'harbour', 'center_lat': 37.80, 'center_lon': -122.40,
+         'radius_meters': 500.0, 'zone_type': 'allowed'},
+        {'name': 'typo', 'center_lat': 37.81, 'center_lon': -122.41,
+         'radius_meters': 50.0, 'zone_type': 'forbiden'},
+        {'name': 'no_radius', 'center_lat': 37.82, 'center_lon': -122.42,
+         'zone_type': 'forbidden'},
+        {'name': 'pier', 'center_lat': 37.805, 'center_lon': -122.405,
+         'radius_meters': 20.0, 'zone_type': 'forbidden'},
+    ])
+
+    zones = load_geofence_zones(config_file)
+
+    assert [zone.name for zone in zones] == ['harbour', 'pier']
+    assert zones[0].is_allowed
+    assert not zones[1].is_allowed
+
+
+def test_zone_type_is_normalised(tmp_path):
+    config_file = _write_zones(tmp_path / "geofence_zones.yaml", [
+        {'name': 'rocks', 'center_lat': 37.80, 'center_lon': -122.40,
+         'radius_meters': 30.0, 'zone_type': ' Forbidden '},
+    ])
+
+    zones = load_geofence_zones(config_file)
+
+    assert len(zones) == 1
+    assert zones[0].zone_type == 'forbidden'
+    assert not zones[0].is_allowed